@@ -0,0 +1,69 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Dry run of a test generator with the DryRunExecutor instead of a simulator, to measure the overhead of the generator
+itself (tests per second and memory over time) before spending simulator hours on it.
+
+    python dry_run_benchmark.py sva [--time-budget 60] [--latency 0.0] [--sampled-latency] [--map-size 200] [--samples dry_run.csv]
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import logging as log
+
+from gabe_core.dry_run import DryRunExecutor, fixed_latency, sampled_latency
+
+
+GENERATORS = {'sva': ('gabe_sva_control_parameter_generator', 'GABE_SVA_CP_TestGenerator'),
+              'svb': ('gabe_svb_control_parameter_generator', 'GABE_SVB_CP_TestGenerator'),
+              'svc': ('gabe_svc_control_parameter_generator', 'GABE_SVC_CP_TestGenerator'),
+              'bezier_random': ('bezier_random_generator', 'Bezier_Random_TestGenerator'),
+              'random_tool_comp': ('random_tool_comp_generator', 'Random_Tool_Comp_TestGenerator')}
+
+
+def dry_run(generator, time_budget=60, latency=0.0, sampled=False, map_size=200, seed=None, sample_every=50, **generator_kwargs):
+    module, class_name = GENERATORS[generator]
+    generator_class = getattr(importlib.import_module(module), class_name)
+    executor = DryRunExecutor(time_budget=time_budget, latency=sampled_latency(latency) if sampled and latency > 0 else fixed_latency(latency),
+                              sample_every=sample_every, seed=seed)
+    test_generator = generator_class(executor=executor, map_size=map_size, seed=seed, **generator_kwargs)
+    try:
+        test_generator.start()
+    except TimeoutError:
+        pass
+    return executor, test_generator
+
+
+def skipped_evaluations(test_generator):
+    # Individuals evaluated without running a test, per reason
+    skipped = {'duplicates': getattr(test_generator, 'skipped_duplicates', 0)}
+    fidelity_screen = getattr(test_generator, 'fidelity_screen', None)
+    if fidelity_screen is not None:
+        skipped['low_fidelity'] = fidelity_screen.counts['low']
+    return skipped
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Dry run of a test generator with a synthetic fitness")
+    parser.add_argument('generator', choices=sorted(GENERATORS))
+    parser.add_argument('--time-budget', type=float, default=60, help="wall clock seconds of the dry run")
+    parser.add_argument('--latency', type=float, default=0.0, help="(mean) seconds per simulated test")
+    parser.add_argument('--sampled-latency', action='store_true', help="draw the latency log-normally around --latency")
+    parser.add_argument('--map-size', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--sample-every', type=int, default=50, help="tests between two samples of rate and memory")
+    parser.add_argument('--samples', default=None, help="CSV file for the samples of rate and memory over time")
+    args = parser.parse_args()
+
+    log.basicConfig(level=log.WARNING)
+    executor, test_generator = dry_run(args.generator, args.time_budget, args.latency, args.sampled_latency, args.map_size, args.seed, args.sample_every)
+    print(json.dumps(executor.report(skipped_evaluations(test_generator)), indent=2))
+    if args.samples:
+        with open(args.samples, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['elapsed_seconds', 'tests', 'tests_per_second', 'memory_mb'])
+            writer.writerows(executor.samples)
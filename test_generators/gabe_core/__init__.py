@@ -0,0 +1,11 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Core shared by the test generators: geometry kernels, variation operators, test execution and results I/O.
+
+The package deliberately imports nothing on its own, the generators import the submodules they need. Heavy modules
+are only imported where they are used: matplotlib in the drawing process of the background visualizer, DEAP in
+genetic_search and the operators working on DEAP individuals, scipy not at all.
+"""
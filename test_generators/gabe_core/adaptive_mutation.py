@@ -0,0 +1,57 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Success rule for the step size (mutation range) of the control point mutation. A mutation is successful if the mutant
+has a lower fitness (min OOB distance) than the individual it was mutated from. After every window of mutations the
+success rate is compared to 1/5: while the mutants keep improving, the search is in a promising region and the steps
+are refined, if fewer than one in five improve, the search has stalled and the steps are widened. This is the reverse
+of Rechenberg's 1/5th rule, as the goal is to find failures rather than to converge to a single optimum.
+"""
+
+import csv
+import logging as log
+import os
+
+
+class SuccessRuleStepSize():
+    def __init__(self, map_size, initial_range=None, target_rate=0.2, factor=0.82, window=10, min_range=None, max_range=None, trajectory_path=None):
+        self.mutation_range = map_size / 40 if initial_range is None else initial_range
+        self.target_rate = target_rate
+        self.factor = factor
+        self.window = window
+        self.min_range = map_size / 400 if min_range is None else min_range
+        self.max_range = map_size / 8 if max_range is None else max_range
+        self.trials = 0
+        self.successes = 0
+        self.updates = 0
+        # (update nr, success rate of the window, new mutation range)
+        self.trajectory = [(0, None, self.mutation_range)]
+        self.trajectory_path = trajectory_path
+        if self.trajectory_path:
+            os.makedirs(os.path.dirname(self.trajectory_path) or '.', exist_ok=True)
+            with open(self.trajectory_path, mode='w', newline='') as file:
+                csv.writer(file).writerow(['update', 'success_rate', 'mutation_range'])
+
+    def record(self, parent_fitness, mutant_fitness):
+        self.trials += 1
+        if mutant_fitness < parent_fitness:
+            self.successes += 1
+        if self.trials >= self.window:
+            self._update()
+
+    def _update(self):
+        success_rate = self.successes / self.trials
+        if success_rate > self.target_rate:
+            self.mutation_range = max(self.min_range, self.mutation_range * self.factor)
+        elif success_rate < self.target_rate:
+            self.mutation_range = min(self.max_range, self.mutation_range / self.factor)
+        self.trials = 0
+        self.successes = 0
+        self.updates += 1
+        self.trajectory.append((self.updates, success_rate, self.mutation_range))
+        log.info("Mutation range %.3f after a success rate of %.2f", self.mutation_range, success_rate)
+        if self.trajectory_path:
+            with open(self.trajectory_path, mode='a', newline='') as file:
+                csv.writer(file).writerow([self.updates, round(success_rate, 3), round(self.mutation_range, 3)])
@@ -0,0 +1,158 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Population of control point individuals stored in one contiguous array of shape (pop, 2, N) with a parallel fitness
+array, together with vectorized versions of the operators used by the GABE generators (tournament selection,
+deap.tools.cxTwoPoint and the control point mutation) and an eaSimple equivalent working on it.
+"""
+
+import numpy as np
+
+
+class ArrayPopulation():
+    def __init__(self, genes, fitness=None):
+        self.genes = np.array(genes, dtype=float)
+        # NaN marks an individual whose fitness is invalid (not evaluated yet)
+        self.fitness = np.full(len(self.genes), np.nan) if fitness is None else np.array(fitness, dtype=float)
+        self.skipped = np.zeros(len(self.genes), dtype=bool)
+
+    @classmethod
+    def from_individuals(cls, individuals):
+        fitness = [ind.fitness.values[0] if ind.fitness.valid else np.nan for ind in individuals]
+        return cls([[list(coordinates) for coordinates in ind] for ind in individuals], fitness)
+
+    def __len__(self):
+        return len(self.genes)
+
+    def invalid_indices(self):
+        return np.flatnonzero(np.isnan(self.fitness))
+
+    def view(self, index, icls):
+        """DEAP individual (e.g. creator.Individual) holding a copy of the genes and fitness of one row.
+        """
+        individual = icls([row.tolist() for row in self.genes[index]])
+        if not np.isnan(self.fitness[index]):
+            individual.fitness.values = (self.fitness[index],)
+        return individual
+
+    def views(self, icls):
+        return [self.view(index, icls) for index in range(len(self))]
+
+    def evaluate(self, evaluate, icls, map_function=map):
+        """Evaluate all individuals with an invalid fitness with the generator's (DEAP style) evaluate function.
+        """
+        invalid = self.invalid_indices()
+        views = [self.view(index, icls) for index in invalid]
+        fitnesses = map_function(evaluate, views)
+        # Individuals the generator skipped as near-duplicates of known failures
+        self.skipped = np.zeros(len(self), dtype=bool)
+        for index, view, fitness in zip(invalid, views, fitnesses):
+            self.fitness[index] = fitness[0]
+            self.skipped[index] = getattr(view, 'skipped_duplicate', False)
+        return len(invalid)
+
+    def select_tournament(self, k, tournsize, rng):
+        """Vectorized deap.tools.selTournament for a minimized fitness.
+        """
+        aspirants = rng.integers(0, len(self), size=(k, tournsize))
+        fitness = np.where(np.isnan(self.fitness), np.inf, self.fitness)[aspirants]
+        winners = aspirants[np.arange(k), np.argmin(fitness, axis=1)]
+        return ArrayPopulation(self.genes[winners], self.fitness[winners])
+
+    def crossover_two_point(self, cxpb, rng):
+        """deap.tools.cxTwoPoint applied with probability cxpb to the pairs (0, 1), (2, 3), ... in place.
+
+        As for the list individuals, the cut points are drawn over the coordinate lists, i.e. for [xs, ys]
+        individuals a crossover always exchanges the ys.
+        """
+        pairs = len(self) // 2
+        size = self.genes.shape[1]
+        mated = rng.random(pairs) < cxpb
+        cxpoint1 = rng.integers(1, size + 1, size=pairs)
+        cxpoint2 = rng.integers(1, size, size=pairs)
+        cxpoint2 = np.where(cxpoint2 >= cxpoint1, cxpoint2 + 1, cxpoint2)
+        low, high = np.minimum(cxpoint1, cxpoint2), np.maximum(cxpoint1, cxpoint2)
+
+        rows = np.arange(size)
+        swap = mated[:, np.newaxis] & (rows >= low[:, np.newaxis]) & (rows < high[:, np.newaxis])
+        first, second = self.genes[0:2 * pairs:2], self.genes[1:2 * pairs:2]
+        swapped_first = np.where(swap[:, :, np.newaxis], second, first)
+        swapped_second = np.where(swap[:, :, np.newaxis], first, second)
+        self.genes[0:2 * pairs:2], self.genes[1:2 * pairs:2] = swapped_first, swapped_second
+
+        self.fitness[0:2 * pairs:2][mated] = np.nan
+        self.fitness[1:2 * pairs:2][mated] = np.nan
+        return int(mated.sum())
+
+    def mutate(self, mutpb, indpb, map_size, rng, mutation_range=None):
+        """Vectorized control point mutation, applied to each individual with probability mutpb, in place.
+
+        Every inner control point is mutated with probability indpb by moving its x and its y value up or down by a
+        uniform step of at most mutation_range (map_size/40 by default). Redrawing a step until the value stays inside
+        the map is the same as drawing it uniformly from the range that keeps it inside.
+        """
+        mutation_range = map_size / 40 if mutation_range is None else mutation_range
+        pop, _, n = self.genes.shape
+        mutated = rng.random(pop) < mutpb
+        selected = (rng.random((pop, n)) < indpb) & mutated[:, np.newaxis]
+        # Neither the first nor the last control point is mutated to avoid map boundary violations
+        selected[:, 0] = False
+        selected[:, -1] = False
+
+        increase = rng.random(self.genes.shape) > 0.5
+        step = rng.random(self.genes.shape)
+        room = np.where(increase, map_size - self.genes, self.genes)
+        limit = np.minimum(mutation_range, np.maximum(room, 0.0))
+        new_genes = self.genes + np.where(increase, 1.0, -1.0) * step * limit
+        self.genes = np.where(selected[:, np.newaxis, :], new_genes, self.genes)
+
+        self.fitness[mutated] = np.nan
+        return int(mutated.sum())
+
+
+def ea_simple_array(population, evaluate, icls, cxpb, mutpb, ngen, map_size, rng, indpb=0.5, tournsize=3, stats=None,
+                    halloffame=None, verbose=False, logbook_header=('gen', 'nevals'), map_function=map, step_size=None):
+    """deap.algorithms.eaSimple on an ArrayPopulation. The usual tools.HallOfFame and tools.Statistics (with the
+    default key of the GABE generators, the fitness values) can be used: the registered statistics are computed on the
+    fitness array and the hall of fame only receives DEAP views of the best individuals.
+
+    With a step_size (see SuccessRuleStepSize) its mutation_range is used and every mutant that was not crossed is
+    recorded with the fitness of the individual it was mutated from.
+    """
+    from deap import tools
+
+    logbook = tools.Logbook()
+    logbook.header = list(logbook_header) + (stats.fields if stats else [])
+
+    def record(gen, nevals):
+        if halloffame is not None:
+            # Only the best maxsize individuals can enter the hall of fame
+            best = np.argsort(population.fitness, kind='stable')[:halloffame.maxsize]
+            halloffame.update([population.view(index, icls) for index in best])
+        # One fitness tuple per individual, as the values stats.compile gets from the key ind.fitness.values
+        values = population.fitness[:, np.newaxis]
+        record = {key: func(values) for key, func in stats.functions.items()} if stats else {}
+        logbook.record(gen=gen, nevals=nevals, **record)
+        if verbose:
+            print(logbook.stream)
+
+    record(0, population.evaluate(evaluate, icls, map_function))
+
+    for gen in range(1, ngen + 1):
+        population = population.select_tournament(len(population), tournsize, rng)
+        population.crossover_two_point(cxpb, rng)
+        if step_size is None:
+            population.mutate(mutpb, indpb, map_size, rng)
+            record(gen, population.evaluate(evaluate, icls, map_function))
+            continue
+        parent_fitness = population.fitness.copy()
+        population.mutate(mutpb, indpb, map_size, rng, step_size.mutation_range)
+        mutants = np.isnan(population.fitness) & ~np.isnan(parent_fitness)
+        record(gen, population.evaluate(evaluate, icls, map_function))
+        mutants &= ~population.skipped
+        for parent, mutant in zip(parent_fitness[mutants], population.fitness[mutants]):
+            step_size.record(parent, mutant)
+
+    return population, logbook
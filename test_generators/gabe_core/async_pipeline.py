@@ -0,0 +1,65 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Evaluation of a batch of individuals as an asyncio pipeline. Preparing the road (geometry, test object, validation),
+simulating it and recording the outcome (OOB reduction, CSV files) are separate tasks connected by bounded queues, so
+the next roads are prepared and the last outcome is written while the simulator is busy. Every stage runs its blocking
+work in a thread of its own, so there is never more than one simulation at a time and the results are recorded in
+the order of the individuals.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+async def _pipeline(prepare, execute, record, items, queue_size):
+    loop = asyncio.get_running_loop()
+    prepared_queue = asyncio.Queue(maxsize=queue_size)
+    executed_queue = asyncio.Queue(maxsize=queue_size)
+    results = [None] * len(items)
+
+    with ThreadPoolExecutor(1, thread_name_prefix="geometry") as geometry_pool, \
+            ThreadPoolExecutor(1, thread_name_prefix="simulation") as simulation_pool, \
+            ThreadPoolExecutor(1, thread_name_prefix="recording") as recording_pool:
+
+        async def prepare_stage():
+            for index, item in enumerate(items):
+                prepared = await loop.run_in_executor(geometry_pool, prepare, item)
+                await prepared_queue.put((index, item, prepared))
+            await prepared_queue.put(None)
+
+        async def execute_stage():
+            while True:
+                entry = await prepared_queue.get()
+                if entry is None:
+                    break
+                index, item, prepared = entry
+                result = await loop.run_in_executor(simulation_pool, execute, prepared)
+                await executed_queue.put((index, item, prepared, result))
+            await executed_queue.put(None)
+
+        async def record_stage():
+            while True:
+                entry = await executed_queue.get()
+                if entry is None:
+                    break
+                index, item, prepared, result = entry
+                results[index] = await loop.run_in_executor(recording_pool, record, item, prepared, result)
+
+        await asyncio.gather(prepare_stage(), execute_stage(), record_stage())
+
+    return results
+
+
+def pipelined_map(prepare, execute, record, items, queue_size=2):
+    """[record(item, prepared, execute(prepared)) for item in items] with prepared = prepare(item), pipelined.
+
+    queue_size bounds how far the preparation may run ahead of the simulation and the simulation ahead of the
+    recording.
+    """
+    items = list(items)
+    if not items:
+        return []
+    return asyncio.run(_pipeline(prepare, execute, record, items, queue_size))
@@ -0,0 +1,83 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Non-blocking visualization of the executed tests. The roads and their OOB traces are drawn by a separate process fed
+through a small queue, frames are dropped whenever the drawing process falls behind so the search never waits for it.
+"""
+
+import logging as log
+import multiprocessing
+import queue
+
+
+def _draw_frames(frame_queue):
+    # matplotlib is only needed (and imported) in the drawing process
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    figure, axes = plt.subplots()
+    while True:
+        frame = frame_queue.get()
+        if frame is None:
+            break
+
+        road_points, trace, title = frame
+        axes.clear()
+        axes.plot([p[0] for p in road_points], [p[1] for p in road_points], color='gray', linewidth=8, alpha=0.5)
+        if trace:
+            axes.scatter([t[0] for t in trace], [t[1] for t in trace], c=[t[2] for t in trace], cmap='RdYlGn_r', vmin=0.0, vmax=1.0, s=6)
+        axes.set_aspect('equal')
+        axes.set_title(title)
+        figure.canvas.draw_idle()
+        plt.pause(0.001)
+
+    plt.close(figure)
+
+
+class BackgroundRoadVisualizer():
+    def __init__(self, queue_size=2):
+        self.queue_size = queue_size
+        self.frame_queue = None
+        self.process = None
+        self.dropped_frames = 0
+
+    def _start(self):
+        # A forked child would inherit the search process with its threads and the GUI state of matplotlib
+        context = multiprocessing.get_context("spawn")
+        self.frame_queue = context.Queue(maxsize=self.queue_size)
+        self.process = context.Process(target=_draw_frames, args=(self.frame_queue,), daemon=True)
+        self.process.start()
+
+    def submit(self, road_points, execution_data, test_outcome):
+        """Queue a test for drawing without ever blocking the caller.
+        """
+        if self.process is None:
+            self._start()
+
+        # Only ship what is drawn to the other process, not the complete simulation states
+        trace = [(state.pos[0], state.pos[1], state.oob_percentage) for state in (execution_data or []) if hasattr(state, 'pos')]
+        frame = ([(p[0], p[1]) for p in road_points], trace, "Test outcome: {}".format(test_outcome))
+
+        try:
+            self.frame_queue.put_nowait(frame)
+        except queue.Full:
+            # The drawing process fell behind, replace the oldest pending frame by the current one
+            self.dropped_frames += 1
+            try:
+                self.frame_queue.get_nowait()
+                self.frame_queue.put_nowait(frame)
+            except (queue.Empty, queue.Full):
+                pass
+            log.debug("Visualizer fell behind, %d frames dropped so far", self.dropped_frames)
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.frame_queue.put(None, timeout=1)
+        except queue.Full:
+            pass
+        self.process.join(timeout=5)
+        self.process = None
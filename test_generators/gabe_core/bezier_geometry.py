@@ -0,0 +1,80 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Vectorized Bézier geometry shared by the Bézier based test generators.
+"""
+
+from math import comb
+import numpy as np
+
+MAX_ROAD_POINTS = 500 # max permissable number of roadpoints of the code pipeline
+MIN_RADIUS = 47 / 3.280839895 # The pipeline rejects roads as too sharp below a radius of 47, measured in feet
+
+
+def bernstein_matrix(n_points, t):
+    """Matrix of the Bernstein basis polynomials of degree n_points-1, one row per parameter value in t.
+    """
+    t = np.asarray(t, dtype=float)[:, np.newaxis]
+    n = n_points - 1
+    k = np.arange(n_points)
+    coeff = np.array([comb(n, i) for i in k], dtype=float)
+    return coeff * t ** k * (1 - t) ** (n - k)
+
+
+def bezier_curve(control_points, t):
+    """Points of the Bézier curve defined by control_points (N x 2) at the parameter values t. A batch of curves
+    (n x N x 2) is evaluated at once and gives n x len(t) x 2 points.
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    return bernstein_matrix(control_points.shape[-2], t) @ control_points
+
+
+def bezier_derivative_points(control_points):
+    """Control points of the first derivative (hodograph) of a Bézier curve.
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    return (control_points.shape[-2] - 1) * np.diff(control_points, axis=-2)
+
+
+def bezier_curvature(control_points, t):
+    """Signed curvature of the Bézier curve (or batch of curves) at the parameter values t.
+    """
+    d1_points = bezier_derivative_points(control_points)
+    d2_points = bezier_derivative_points(d1_points)
+    d1 = bezier_curve(d1_points, t)
+    d2 = bezier_curve(d2_points, t)
+    cross = d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]
+    speed = np.linalg.norm(d1, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(speed > 0, cross / speed ** 3, 0.0)
+
+
+def adaptive_bezier_points(control_points, chord_tolerance=0.05, max_segment_length=10.0, min_points=4, max_points=MAX_ROAD_POINTS, dense_num=2000):
+    """Sample a Bézier curve by arc length and curvature instead of uniformly in t.
+
+    A circular arc of radius R approximated by a chord of length c deviates at most c^2/(8R) from the chord, so the
+    local point spacing is chosen as sqrt(8*chord_tolerance/|curvature|), capped by max_segment_length. Straight parts
+    therefore get few points and tight curves many. If the tolerance would require more than max_points points, the
+    spacing is scaled up uniformly to stay within the limit of the pipeline.
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    t_dense = np.linspace(0, 1, num=dense_num)
+    dense = bezier_curve(control_points, t_dense)
+    arc_length = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(dense, axis=0), axis=1))))
+    curvature = np.abs(bezier_curvature(control_points, t_dense))
+
+    # Number of points needed per meter of road
+    density = np.maximum(np.sqrt(curvature / (8 * chord_tolerance)), 1.0 / max_segment_length)
+    cumulative_density = np.concatenate(([0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(arc_length))))
+
+    num = int(np.ceil(cumulative_density[-1])) + 1
+    num = min(max(num, min_points), max_points)
+
+    # Invert the cumulative density to get parameter values that are spread evenly in "needed points"
+    targets = np.linspace(0, cumulative_density[-1], num=num)
+    t = np.interp(targets, cumulative_density, t_dense)
+    t[0], t[-1] = 0.0, 1.0
+
+    return bezier_curve(control_points, t)
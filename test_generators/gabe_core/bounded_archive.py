@@ -0,0 +1,80 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Archive with a fixed number of entries in memory. When it is full, the oldest entry is appended to a binary log on disk
+(length prefixed pickles) and only its file offset is kept, so spilled entries can still be read and queried.
+"""
+
+from array import array
+from collections import deque
+import os
+import pickle
+import struct
+
+_LENGTH = struct.Struct('<Q')
+
+
+class BoundedArchive():
+    def __init__(self, capacity=1000, spill_path=None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.entries = deque()
+        # 8 bytes per spilled entry instead of the entry itself
+        self.offsets = array('q')
+        self._spill_file = None
+
+    def __len__(self):
+        return len(self.offsets) + len(self.entries)
+
+    def _file(self):
+        # Opened on the first spill, and again if the archive is queried after close()
+        if self._spill_file is None:
+            os.makedirs(os.path.dirname(self.spill_path) or '.', exist_ok=True)
+            self._spill_file = open(self.spill_path, mode='a+b')
+        return self._spill_file
+
+    def _spill(self, entry):
+        if self.spill_path is None:
+            return # Without a spill file the oldest entries are dropped
+        spill_file = self._file()
+        spill_file.seek(0, os.SEEK_END)
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self.offsets.append(spill_file.tell())
+        spill_file.write(_LENGTH.pack(len(data)) + data)
+
+    def append(self, entry):
+        self.entries.append(entry)
+        while len(self.entries) > self.capacity:
+            self._spill(self.entries.popleft())
+
+    def _read(self, offset):
+        spill_file = self._file()
+        spill_file.flush()
+        spill_file.seek(offset)
+        length, = _LENGTH.unpack(spill_file.read(_LENGTH.size))
+        return pickle.loads(spill_file.read(length))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("archive index out of range")
+        if index < len(self.offsets):
+            return self._read(self.offsets[index])
+        return self.entries[index - len(self.offsets)]
+
+    def __iter__(self):
+        # Spilled entries first, i.e. in the order they were appended
+        for offset in self.offsets:
+            yield self._read(offset)
+        yield from list(self.entries)
+
+    def query(self, predicate):
+        return [entry for entry in self if predicate(entry)]
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
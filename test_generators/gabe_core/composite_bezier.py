@@ -0,0 +1,242 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Composite roads made of C1-continuous Bézier segments of a fixed low degree. The genome keeps the [xs, ys] layout of
+the single Bézier individuals: segment j uses the control points degree*j ... degree*(j+1), the junctions are shared.
+C1 continuity is enforced by mirroring the last inner control point of a segment at the junction to obtain the first
+inner control point of the following segment.
+
+Segment geometry and validation results are cached by the segment's control points, so after a mutation only the
+segments that actually changed are recomputed.
+
+Random roads are built segment by segment: every segment starts at the end point and in the direction of the previous
+one and turns by at most as much as the minimum radius allows over its length. Control points drawn over the whole
+map give almost only invalid roads as soon as there are more than two segments.
+"""
+
+from collections import OrderedDict
+import logging as log
+import math
+import random
+import numpy as np
+
+from .bezier_geometry import bernstein_matrix, bezier_curvature, MAX_ROAD_POINTS, MIN_RADIUS
+
+
+def enforce_c1(individual, degree=3):
+    """Make the outgoing handle of every interior junction the mirror of the incoming one (in place).
+    """
+    for junction in range(degree, len(individual[0]) - 1, degree):
+        for coordinates in individual:
+            coordinates[junction + 1] = 2 * coordinates[junction] - coordinates[junction - 1]
+    return individual
+
+
+def _segments_intersect(p, q):
+    # Vectorized test whether any line piece of polyline p properly crosses any line piece of polyline q
+    a, b = p[:-1, np.newaxis], p[1:, np.newaxis]
+    c, d = q[np.newaxis, :-1], q[np.newaxis, 1:]
+
+    def orientation(u, v, w):
+        return (v[..., 0] - u[..., 0]) * (w[..., 1] - u[..., 1]) - (v[..., 1] - u[..., 1]) * (w[..., 0] - u[..., 0])
+
+    return bool(np.any((orientation(a, b, c) * orientation(a, b, d) < 0) & (orientation(c, d, a) * orientation(c, d, b) < 0)))
+
+
+class CompositeBezierRoad():
+    def __init__(self, map_size, degree=3, points_per_segment=50, min_radius=MIN_RADIUS, map_margin=4, cache_size=4096):
+        self.map_size = map_size
+        self.degree = degree
+        self.points_per_segment = points_per_segment
+        self.min_radius = min_radius
+        self.map_margin = map_margin # Half of the road width has to stay inside the map
+        self.cache_size = cache_size
+        self.t = np.linspace(0, 1, num=points_per_segment)
+        self.basis = bernstein_matrix(degree + 1, self.t)
+        self._segment_cache = OrderedDict()
+        self._pair_cache = OrderedDict()
+        self.computed_segments = 0
+
+    def _fits(self, points, max_curvature):
+        # Curvature bound and map boundaries of a single segment
+        inside = np.all(points.min(axis=0) >= self.map_margin) and np.all(points.max(axis=0) <= self.map_size - self.map_margin)
+        return bool(inside) and max_curvature <= 1.0 / self.min_radius
+
+    def _local_segment(self, start, handle, heading, segment_length, rng):
+        # Control points of a segment from start, leaving it in direction heading with the mirrored handle length
+        length = rng.uniform(0.6, 1.0) * segment_length
+        # A circular arc of the minimum radius turns by length / min_radius
+        max_turn = min(math.pi / 2, 0.8 * length / self.min_radius)
+        turn = rng.uniform(-max_turn, max_turn)
+        end_heading = heading + turn
+        end = start + length * np.array([math.cos(heading + turn / 2), math.sin(heading + turn / 2)])
+        out_handle = rng.uniform(0.2, 0.4) * length
+        first_inner = start + handle * np.array([math.cos(heading), math.sin(heading)])
+        last_inner = end - out_handle * np.array([math.cos(end_heading), math.sin(end_heading)])
+        # Inner points of higher degrees lie between the two handles
+        inner = [first_inner + (last_inner - first_inner) * i / (self.degree - 2) for i in range(self.degree - 1)] if self.degree > 2 else [first_inner]
+        return np.array([start] + inner + [end]), end_heading, out_handle
+
+    def random_road(self, number_of_segments, rng=random, max_guesses=25):
+        """Random C1 road [xs, ys] of number_of_segments segments inside the map, within the curvature bound and
+        without self-intersections, starting around the middle of the lower map border.
+        """
+        segment_length = 0.8 * self.map_size / number_of_segments
+        for _ in range(max_guesses):
+            start = np.array([rng.uniform(self.map_size / 2 - self.map_size / 10, self.map_size / 2 + self.map_size / 10), max(self.map_size / 40, self.map_margin + 1.0)])
+            heading = math.pi / 2
+            handle = rng.uniform(0.2, 0.4) * segment_length
+            segments = []
+            for _ in range(number_of_segments):
+                for _ in range(max_guesses):
+                    control_points, end_heading, out_handle = self._local_segment(start, handle, heading, segment_length, rng)
+                    points = self.basis @ control_points
+                    if not self._fits(points, float(np.abs(bezier_curvature(control_points, self.t)).max())):
+                        continue
+                    # Adjacent segments share a junction, only the earlier ones can be crossed
+                    if any(_segments_intersect(points, previous[1]) for previous in segments[:-1]):
+                        continue
+                    break
+                else:
+                    break # No way to continue this road, start a new one
+                segments.append((control_points, points))
+                start, heading, handle = control_points[-1], end_heading, out_handle
+
+            if len(segments) == number_of_segments:
+                control_points = np.concatenate([segments[0][0]] + [segment[0][1:] for segment in segments[1:]])
+                return [control_points[:, 0].tolist(), control_points[:, 1].tolist()]
+
+        log.warning("No valid road of %d segments found in %d guesses", number_of_segments, max_guesses)
+        return None
+
+    def number_of_segments(self, individual):
+        return (len(individual[0]) - 1) // self.degree
+
+    def _segment_key(self, individual, segment):
+        start = segment * self.degree
+        return tuple(individual[0][start:start + self.degree + 1]) + tuple(individual[1][start:start + self.degree + 1])
+
+    def _cached(self, cache, key, compute):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        value = compute()
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def _compute_segment(self, key):
+        self.computed_segments += 1
+        n = self.degree + 1
+        control_points = np.column_stack((key[:n], key[n:]))
+        points = self.basis @ control_points
+        curvature = np.abs(bezier_curvature(control_points, self.t))
+        return points, float(curvature.max()), points.min(axis=0), points.max(axis=0)
+
+    def segment(self, individual, segment):
+        """(points, max curvature, bounding box min, bounding box max) of one segment, computed only if not cached.
+        """
+        key = self._segment_key(individual, segment)
+        return self._cached(self._segment_cache, key, lambda: self._compute_segment(key))
+
+    def road_points(self, individual):
+        # Consecutive segments share their junction point, keep it only once
+        pieces = [self.segment(individual, s)[0] for s in range(self.number_of_segments(individual))]
+        points = np.concatenate([pieces[0]] + [piece[1:] for piece in pieces[1:]])
+        if len(points) > MAX_ROAD_POINTS:
+            points = points[np.linspace(0, len(points) - 1, num=MAX_ROAD_POINTS).astype(int)]
+        return points
+
+    def bezier_set(self, individual):
+        """Road in the [x_bezier, y_bezier] layout returned by the generators' _bezier_calculation.
+        """
+        points = self.road_points(individual)
+        return [points[:, 0], points[:, 1]]
+
+    def _pair_intersects(self, individual, s1, s2):
+        key = (self._segment_key(individual, s1), self._segment_key(individual, s2))
+
+        def compute():
+            p, _, p_min, p_max = self.segment(individual, s1)
+            q, _, q_min, q_max = self.segment(individual, s2)
+            if np.any(p_max < q_min) or np.any(q_max < p_min):
+                return False
+            return _segments_intersect(p, q)
+
+        return self._cached(self._pair_cache, key, compute)
+
+    def validate(self, individual):
+        """Geometric validity check of the road, returns (is_valid, validation_msg) like the pipeline's TestValidator.
+        """
+        segments = range(self.number_of_segments(individual))
+        for s in segments:
+            _, max_curvature, bb_min, bb_max = self.segment(individual, s)
+            if np.any(bb_min < self.map_margin) or np.any(bb_max > self.map_size - self.map_margin):
+                return False, "Not entirely inside the map boundaries"
+            if max_curvature > 1.0 / self.min_radius:
+                return False, "The road is too sharp"
+
+        for s1 in segments:
+            # Adjacent segments share a junction, only non-adjacent ones can intersect properly
+            for s2 in range(s1 + 2, self.number_of_segments(individual)):
+                if self._pair_intersects(individual, s1, s2):
+                    return False, "The road is self-intersecting"
+
+        return True, ""
+
+    def _segments_fit(self, individual, segments):
+        for s in segments:
+            points, max_curvature, _, _ = self.segment(individual, s)
+            if not self._fits(points, max_curvature):
+                return False
+        return True
+
+    def mutate(self, individual, indpb, mutation_range, rng=random):
+        """Perturb the free control points of each segment with probability indpb.
+
+        The start point of the road and its last control point are kept fixed, as in the single Bézier mutation.
+        Every other control point not derived by the C1 constraint is moved within mutation_range. A perturbation
+        taking the segment, or the following one sharing its junction, outside the map or beyond the curvature bound
+        is undone.
+        """
+        last = len(individual[0]) - 1
+        number_of_segments = self.number_of_segments(individual)
+        enforce_c1(individual, self.degree)
+        for segment in range(number_of_segments):
+            if rng.uniform(0, 1) >= indpb:
+                continue
+            start = segment * self.degree
+            previous = [list(coordinates) for coordinates in individual]
+            for cp in range(start + 1, start + self.degree + 1):
+                # The first inner point of every segment but the first is the mirrored handle of the previous one
+                if cp == last or (segment > 0 and cp == start + 1):
+                    continue
+                for coordinates in individual:
+                    new_value = coordinates[cp] + rng.uniform(-mutation_range, mutation_range)
+                    coordinates[cp] = min(max(new_value, 0.0), float(self.map_size))
+            enforce_c1(individual, self.degree)
+
+            if not self._segments_fit(individual, range(segment, min(segment + 2, number_of_segments))):
+                for coordinates, old_coordinates in zip(individual, previous):
+                    coordinates[:] = old_coordinates
+
+        return individual,
+
+    def crossover(self, ind1, ind2, rng=random):
+        """Two point crossover that exchanges whole segments between the parents.
+        """
+        segments = min(self.number_of_segments(ind1), self.number_of_segments(ind2))
+        if segments < 2:
+            return ind1, ind2
+        first, second = sorted(rng.sample(range(segments + 1), 2))
+        # Swap all control points of the segments between junction first and junction second (the start point stays)
+        start, end = first * self.degree + 1, second * self.degree + 1
+        for coordinates1, coordinates2 in zip(ind1, ind2):
+            coordinates1[start:end], coordinates2[start:end] = coordinates2[start:end], coordinates1[start:end]
+
+        enforce_c1(ind1, self.degree)
+        enforce_c1(ind2, self.degree)
+        return ind1, ind2
@@ -0,0 +1,138 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Executor for dry runs of the test generators without a simulator. The outcome of a test is computed by a synthetic
+fitness function of the road points (by default the min OOB distance of the MockExecutor's driver model, which fails
+about as many valid random roads as the simulator did in the Bézier random runs) and every test takes the time of a
+latency model. Everything else of the generator, i.e. initialization, operators, restarts and result writing, runs
+as in a real campaign, and the executor samples the tests per second and the memory use of the process along the
+way. The time spent in the fitness function stands in for the simulator and is not counted as generator overhead.
+"""
+
+import logging as log
+import time
+import numpy as np
+
+from .mock_executor import MockExecutor, SimulationDataRecord, _road_points_of
+from .oob_statistics import reduce_oob_states
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+
+class KinematicProxy():
+    """min OOB distance of the road driven by the kinematic model of the MockExecutor.
+    """
+    def __init__(self, **model_parameters):
+        self.model = MockExecutor(time_budget=float('inf'), **model_parameters)
+
+    def __call__(self, road_points):
+        _, _, execution_data = self.model.execute_test(road_points)
+        if not execution_data:
+            return self.model.lane_width / 2
+        return reduce_oob_states(execution_data).min_oob_distance
+
+
+def fixed_latency(seconds):
+    return lambda rng: seconds
+
+
+def sampled_latency(mean, sigma=0.25):
+    # Log-normally distributed delay with the given mean, as simulation times are skewed to the right
+    mu = np.log(mean) - sigma ** 2 / 2
+    return lambda rng: float(rng.lognormal(mu, sigma))
+
+
+def _memory_mb():
+    # Current resident set size on Linux, the peak one elsewhere
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except (OSError, AttributeError):
+        pass
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return float('nan')
+
+
+class DryRunExecutor():
+    def __init__(self, time_budget=600, fitness=None, latency=fixed_latency(0.0), oob_tolerance=0.95, car_width=1.8,
+                 sample_every=50, seed=None):
+        self.time_budget = time_budget
+        self.fitness = fitness or KinematicProxy(oob_tolerance=oob_tolerance, car_width=car_width)
+        self.latency = latency
+        self.oob_tolerance = oob_tolerance
+        self.car_width = car_width
+        self.sample_every = sample_every
+        self.rng = np.random.default_rng(seed)
+        self.road_visualizer = None
+        self.start_time = time.time()
+        self.test_count = 0
+        self.latency_total = 0.0
+        self.fitness_total = 0.0
+        # (elapsed seconds, tests, tests per second since the previous sample, memory in MB)
+        self.samples = [(0.0, 0, 0.0, _memory_mb())]
+
+    def get_remaining_time(self):
+        return max(0.0, self.time_budget - (time.time() - self.start_time))
+
+    def execute_test(self, the_test):
+        if self.get_remaining_time() <= 0:
+            # The GA variants only stop when the executor refuses to run further tests
+            raise TimeoutError("Time budget of the dry run used up")
+
+        delay = self.latency(self.rng)
+        time.sleep(delay)
+        self.latency_total += delay
+        self.test_count += 1
+        if self.test_count % self.sample_every == 0:
+            self._sample()
+
+        road_points = _road_points_of(the_test)
+        if len(road_points) < 2:
+            return 'INVALID', "Not enough road points", []
+        start = time.time()
+        oob_distance = self.fitness(road_points)
+        self.fitness_total += time.time() - start
+        oob_percentage = float(np.clip((self.car_width / 2 - oob_distance) / self.car_width, 0.0, 1.0))
+        is_oob = oob_distance < self.car_width / 2
+        state = SimulationDataRecord(timer=delay, pos=(road_points[-1][0], road_points[-1][1], 0.0), dir=(0.0, 0.0, 0.0), vel=(0.0, 0.0, 0.0),
+                                     vel_kmh=0.0, is_oob=is_oob, oob_counter=int(is_oob), max_oob_percentage=oob_percentage,
+                                     oob_distance=oob_distance, oob_percentage=oob_percentage)
+        if oob_percentage > self.oob_tolerance:
+            return 'FAIL', "Car drove out of the lane", [state]
+        return 'PASS', "Successful test", [state]
+
+    def _sample(self):
+        elapsed = time.time() - self.start_time
+        previous_elapsed, previous_tests = self.samples[-1][:2]
+        rate = (self.test_count - previous_tests) / (elapsed - previous_elapsed) if elapsed > previous_elapsed else 0.0
+        self.samples.append((elapsed, self.test_count, rate, _memory_mb()))
+        log.info("Dry run: %d tests after %.1f s, %.1f tests/s, %.1f MB", self.test_count, elapsed, rate, self.samples[-1][3])
+
+    def report(self, skipped=None):
+        """Summary of the dry run, the generator overhead is the time spent neither in the latency model nor in the
+        fitness function. skipped counts, per reason, the individuals the generator evaluated without running a test
+        (near-duplicates of failures, roads screened out by a low fidelity model), they are evaluations as well.
+        """
+        self._sample()
+        elapsed, tests, _, memory = self.samples[-1]
+        skipped = skipped or {}
+        evaluations = tests + sum(skipped.values())
+        overhead = elapsed - self.latency_total - self.fitness_total
+        report = {'tests': tests,
+                  'evaluations': evaluations,
+                  'elapsed_seconds': round(elapsed, 2),
+                  'tests_per_second': round(tests / elapsed, 2) if elapsed > 0 else None,
+                  'evaluations_per_second': round(evaluations / elapsed, 2) if elapsed > 0 else None,
+                  'generator_seconds_per_evaluation': round(overhead / evaluations, 5) if evaluations else None,
+                  'fitness_seconds_per_test': round(self.fitness_total / tests, 5) if tests else None,
+                  'memory_mb': round(memory, 1),
+                  'memory_growth_mb': round(memory - self.samples[0][3], 1)}
+        for reason, count in skipped.items():
+            report['skipped_' + reason] = count
+        return report
@@ -0,0 +1,170 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Pool of warm simulator sessions behind the executor interface of the test generators (execute_test,
+get_remaining_time, road_visualizer). A session is created once by create_session() and then used for many tests,
+so the start-up of the simulator and the loading of the scenario are paid once per session instead of once per test.
+Sessions are health checked before they are handed out and replaced when they failed, raised an error or ran their
+maximum number of tests.
+
+    pool = ExecutorPool(lambda: StubSimulatorSession(startup_time=5.0), size=2, time_budget=3600)
+    generator = GABE_SVA_CP_TestGenerator(executor=pool, map_size=200)
+"""
+
+import logging as log
+import queue
+import threading
+import time
+
+from .mock_executor import MockExecutor
+
+
+class StubSimulatorSession(MockExecutor):
+    """MockExecutor with the wall clock cost of a simulator session.
+
+    Starting the session takes startup_time seconds, loading the scenario of a map size scenario_time seconds. The
+    scenario stays loaded for the following tests of the same map size. With crash_probability the session dies after
+    a test and reports itself as unhealthy.
+    """
+    def __init__(self, startup_time=2.0, scenario_time=0.5, crash_probability=0.0, rng=None, **kwargs):
+        super().__init__(**kwargs)
+        self.scenario_time = scenario_time
+        self.crash_probability = crash_probability
+        self.rng = rng
+        self.map_size = None
+        self.alive = True
+        time.sleep(startup_time)
+
+    def prepare(self, map_size):
+        if map_size != self.map_size:
+            time.sleep(self.scenario_time)
+            self.map_size = map_size
+
+    def execute_test_streaming(self, the_test, on_state):
+        if not self.alive:
+            raise RuntimeError("Simulator session is not running")
+        if self.map_size is None:
+            self.prepare(0)
+        result = super().execute_test_streaming(the_test, on_state)
+        if self.crash_probability and self.rng is not None and self.rng.random() < self.crash_probability:
+            self.alive = False
+        return result
+
+    def is_healthy(self):
+        return self.alive
+
+    def close(self):
+        self.alive = False
+
+
+class ExecutorPool():
+    def __init__(self, create_session, size=1, time_budget=None, max_tests_per_session=None):
+        self.create_session = create_session
+        self.size = size
+        # Wall clock budget of the pool, without one the remaining time of the sessions is used
+        self.time_budget = time_budget
+        self.max_tests_per_session = max_tests_per_session
+        self.road_visualizer = None
+        self.map_size = None
+        self.start_time = time.time()
+        self.idle_sessions = queue.Queue()
+        self.session_count = 0
+        self.recycled = 0
+        self.test_counts = {}
+        self.lock = threading.Lock()
+        self.last_session = None
+
+    @property
+    def oob_tolerance(self):
+        return getattr(self.last_session, 'oob_tolerance', 0.95)
+
+    def _new_session(self):
+        session = self.create_session()
+        if self.map_size is not None and hasattr(session, 'prepare'):
+            session.prepare(self.map_size)
+        self.test_counts[id(session)] = 0
+        self.last_session = session
+        return session
+
+    def warm_up(self, map_size):
+        """Start all sessions and load the scenario of map_size, the following tests all use this map size.
+        """
+        self.map_size = map_size
+        with self.lock:
+            missing = self.size - self.session_count
+            self.session_count += missing
+        for _ in range(missing):
+            self.idle_sessions.put(self._new_session())
+        log.info("Executor pool warmed up with %d sessions for map size %s", self.size, map_size)
+
+    def _is_healthy(self, session):
+        is_healthy = getattr(session, 'is_healthy', None)
+        return is_healthy() if is_healthy is not None else True
+
+    def _recycle(self, session, reason):
+        log.info("Replacing simulator session: %s", reason)
+        self.recycled += 1
+        self.test_counts.pop(id(session), None)
+        close = getattr(session, 'close', None)
+        if close is not None:
+            close()
+        return self._new_session()
+
+    def acquire(self):
+        with self.lock:
+            create = self.idle_sessions.empty() and self.session_count < self.size
+            if create:
+                self.session_count += 1
+        session = self._new_session() if create else self.idle_sessions.get()
+        if not self._is_healthy(session):
+            session = self._recycle(session, "health check failed")
+        return session
+
+    def release(self, session):
+        if self.max_tests_per_session and self.test_counts.get(id(session), 0) >= self.max_tests_per_session:
+            session = self._recycle(session, "{} tests run".format(self.max_tests_per_session))
+        self.idle_sessions.put(session)
+
+    def _execute(self, execute):
+        if self.get_remaining_time() <= 0:
+            # As the executors of the code pipeline, the pool stops the generator once its budget is used up
+            raise TimeoutError("Time budget of the executor pool used up")
+        session = self.acquire()
+        try:
+            result = execute(session)
+            self.test_counts[id(session)] = self.test_counts.get(id(session), 0) + 1
+        except TimeoutError:
+            # The end of the time budget, not a broken session
+            self.release(session)
+            raise
+        except Exception as error:
+            log.warning("Simulator session raised %s", error)
+            session = self._recycle(session, "error during the test")
+            result = 'ERROR', str(error), []
+        self.release(session)
+        return result
+
+    def execute_test(self, the_test):
+        return self._execute(lambda session: session.execute_test(the_test))
+
+    def execute_test_streaming(self, the_test, on_state):
+        def execute(session):
+            if hasattr(session, 'execute_test_streaming'):
+                return session.execute_test_streaming(the_test, on_state)
+            return session.execute_test(the_test)
+        return self._execute(execute)
+
+    def get_remaining_time(self):
+        if self.time_budget is not None:
+            return max(0.0, self.time_budget - (time.time() - self.start_time))
+        if self.last_session is None:
+            return float('inf')
+        return self.last_session.get_remaining_time()
+
+    def close(self):
+        while not self.idle_sessions.empty():
+            close = getattr(self.idle_sessions.get(), 'close', None)
+            if close is not None:
+                close()
@@ -0,0 +1,88 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Archive of failing individuals from earlier runs, read from the failing_TC CSV files, to warm start a GA. A diverse
+subset of the archived genomes is picked by farthest point sampling and perturbed by the usual control point mutation.
+"""
+
+import ast
+import csv
+import copy
+import logging as log
+import os
+import sys
+import numpy as np
+
+from .operators import control_point_mutation
+
+
+def _csv_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, filenames in sorted(os.walk(path)):
+                for filename in sorted(filenames):
+                    if filename.endswith('.csv'):
+                        yield os.path.join(folder, filename)
+        else:
+            yield path
+
+
+def load_failing_individuals(paths, number_of_controlpoints=None):
+    """[xs, ys] genomes of the failing tests in the failing_TC CSV files (or folders of them) in paths.
+
+    Only genomes with number_of_controlpoints control points are returned if it is given.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    # The road_points column of the failing_TC files exceeds the default field size limit
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+    individuals = []
+    for filepath in _csv_files(paths):
+        with open(filepath, newline='') as file:
+            for row in csv.DictReader(file):
+                try:
+                    individual = ast.literal_eval(row.get("individual") or "")
+                except (ValueError, SyntaxError):
+                    continue
+                # The random tool competition baseline stores plain road points, these are no control point genomes
+                if len(individual) != 2 or not all(isinstance(coordinates, list) for coordinates in individual):
+                    continue
+                if len(individual[0]) != len(individual[1]):
+                    continue
+                if number_of_controlpoints is not None and len(individual[0]) != number_of_controlpoints:
+                    continue
+                individuals.append([[float(value) for value in coordinates] for coordinates in individual])
+
+    log.info("Loaded %d failing individuals from the archive", len(individuals))
+    return individuals
+
+
+def select_diverse(individuals, k, rng):
+    """Pick k individuals by farthest point sampling on their control points, starting from a random one.
+    """
+    if k >= len(individuals):
+        return list(individuals)
+
+    genes = np.array([np.concatenate(individual) for individual in individuals])
+    chosen = [int(rng.integers(len(individuals)))]
+    distance = np.linalg.norm(genes - genes[chosen[0]], axis=1)
+    while len(chosen) < k:
+        farthest = int(np.argmax(distance))
+        chosen.append(farthest)
+        distance = np.minimum(distance, np.linalg.norm(genes - genes[farthest], axis=1))
+
+    return [individuals[index] for index in chosen]
+
+
+def warm_start_individuals(archive, k, map_size, rng, random_generator, indpb=0.5):
+    """k diverse archive genomes, each perturbed by one control point mutation.
+    """
+    seeds = []
+    for individual in select_diverse(archive, k, rng):
+        individual = copy.deepcopy(individual)
+        control_point_mutation(individual, indpb, map_size, random_generator)
+        seeds.append(individual)
+    return seeds
@@ -0,0 +1,54 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Index of the failures found so far. Every failing road is resampled to a fixed number of points evenly spread by arc
+length, the distance of two roads is the mean distance of their corresponding points in meters. New roads close to
+a known failure can so be recognized before they are simulated.
+"""
+
+import time
+import numpy as np
+
+
+def polyline_features(road_points, num=32):
+    """The road resampled to num points evenly spaced by arc length, flattened to a vector of 2*num values.
+    """
+    points = np.asarray(road_points, dtype=float)[:, :2]
+    arc_length = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    targets = np.linspace(0, arc_length[-1], num=num)
+    return np.concatenate((np.interp(targets, arc_length, points[:, 0]), np.interp(targets, arc_length, points[:, 1])))
+
+
+class FailureIndex():
+    def __init__(self, threshold=10.0, num=32):
+        self.threshold = threshold
+        self.num = num
+        self.features = np.empty((0, 2 * num))
+        self.failure_times = []
+
+    def __len__(self):
+        return len(self.features)
+
+    def distance(self, road_points):
+        """Mean point distance of road_points to the closest known failure, inf if there is none.
+        """
+        # Taken once, failures may be added by another thread meanwhile
+        features = self.features
+        if len(features) == 0:
+            return np.inf
+        difference = (features - polyline_features(road_points, self.num)).reshape(len(features), 2, self.num)
+        return float(np.min(np.mean(np.hypot(difference[:, 0], difference[:, 1]), axis=1)))
+
+    def is_known(self, road_points):
+        return self.distance(road_points) < self.threshold
+
+    def add(self, road_points):
+        """Add a failing road, returns the time in seconds since the previous failure (None for the first one).
+        """
+        self.features = np.vstack((self.features, polyline_features(road_points, self.num)))
+        self.failure_times.append(time.time())
+        if len(self.failure_times) < 2:
+            return None
+        return self.failure_times[-1] - self.failure_times[-2]
@@ -0,0 +1,249 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Base classes of the test generators: test execution, recording of the outcomes and the Bézier road construction.
+"""
+
+import logging as log
+import os
+import threading
+import time
+import numpy as np
+
+from .background_visualizer import BackgroundRoadVisualizer
+from .bounded_archive import BoundedArchive
+from .live_metrics import LiveMetrics
+from .bezier_geometry import adaptive_bezier_points, bezier_curve
+from .composite_bezier import enforce_c1
+from .oob_statistics import reduce_oob_states
+from .operators import random_control_points
+from .results import ResultFiles
+from .road_queue import RoadQueue, run_workers
+from .seeding import RunSeeds
+from .streaming_execution import EarlyTerminationMonitor, run_test
+from .trace_archive import TraceArchive
+
+
+class TestGeneratorBase():
+    def __init__(self, time_budget=None, executor=None, map_size=None, timestamp_id=None, early_termination=False, executors=None, queue_size=32, seed=None, live_metrics=False, archive_size=None, trace_archive=False, near_failure_distance=None, results_root=None):
+
+        self.time_budget = time_budget
+        self.executor = executor
+        self.map_size = map_size
+        self.max_oob_percentage = 0.0
+        self.min_oob_distance = 2.0
+        self.timestamp_id = timestamp_id or time.strftime("%d%m%Y-%H%M%S")
+        self.fail_cnt = 0
+        self.early_termination = early_termination
+        self.oob_statistics = None
+        self._reduced_execution_data = None
+        self.background_visualizer = BackgroundRoadVisualizer()
+        # With several executors, roads are pre-computed by a producer thread and executed on all of them in parallel
+        self.executors = executors
+        self.queue_size = queue_size
+        self.result_lock = threading.Lock()
+        # All result folders are created below results_root, by default the one of the GABE_RESULTS_ROOT environment variable
+        self.results_root = results_root or os.environ.get('GABE_RESULTS_ROOT', 'empirical_evaluation_results')
+        self.live_metrics = live_metrics
+        self.archive_size = archive_size
+        self.archive = None
+        self.trace_archive = trace_archive
+        self.near_failure_distance = near_failure_distance
+        # Number of tests written to the evaluation CSV, the traces are stored under the row of their test
+        self.test_count = 0
+
+        # Executors keeping simulator sessions warm (see ExecutorPool) are told the map size of the following tests
+        for warm_executor in executors or [executor]:
+            if hasattr(warm_executor, 'warm_up'):
+                warm_executor.warm_up(map_size)
+
+        # Independent random streams derived from one master seed per run
+        self.seeds = RunSeeds(seed)
+        self.seeds.seed_global_random()
+        self.init_random = self.seeds.python_random("initialization")
+        self.init_rng = self.seeds.numpy_generator("initialization")
+        self.mutation_random = self.seeds.python_random("mutation")
+        self.rng = self.seeds.numpy_generator("variation")
+
+    def _setup_results(self, results_folder, run_name, sub_folder=None):
+        # specify where the results should be stored
+        csv_results_path = os.path.join(self.results_root, results_folder)
+        self.result_files = ResultFiles(csv_results_path, run_name, sub_folder)
+        self.csv_results_path = self.result_files.csv_results_path
+        self.evaluation_folder_path = self.result_files.evaluation_folder_path
+        self.failing_TC_folder_path = self.result_files.failing_TC_folder_path
+        self.unique_filename = self.result_files.unique_filename
+        self.csv_failing_filepath = self.result_files.csv_failing_filepath
+        self.csv_eval_filepath = self.result_files.csv_eval_filepath
+        # The run folders are counted to number the runs, so the seed is stored in a folder of its own
+        self.seeds.record(os.path.join(csv_results_path, "run_metadata", self.unique_filename + '.json'), generator=type(self).__name__, map_size=self.map_size)
+        if self.live_metrics:
+            # Status of the running campaign, updated after every test written to the evaluation CSV. live_metrics is
+            # either True or the path of the status file (a .prom file is written in the Prometheus text format)
+            status_path = self.live_metrics if isinstance(self.live_metrics, str) else os.path.join(csv_results_path, "live_status", self.unique_filename + '.json')
+            self.live_metrics = LiveMetrics(status_path)
+        if self.archive_size:
+            # Failing tests and the best individuals of finished searches, at most archive_size of them are kept in
+            # memory, older ones are appended to a log file and read back from there when queried
+            self.archive = BoundedArchive(self.archive_size, os.path.join(csv_results_path, "archive", self.unique_filename + '.bin'))
+        if self.trace_archive:
+            # Simulation traces of the failing tests, trace_archive is either True or the path of the .npz file
+            trace_path = self.trace_archive if isinstance(self.trace_archive, str) else os.path.join(csv_results_path, "traces", self.unique_filename + '.npz')
+            self.trace_archive = TraceArchive(trace_path, self.near_failure_distance)
+
+    def _run_test(self, the_test, executor):
+        monitor = None
+        if self.early_termination:
+            # Stop the simulation as soon as its outcome is known (only used by executors supporting streaming)
+            monitor = EarlyTerminationMonitor(the_test.interpolated_points, oob_tolerance=getattr(executor, 'oob_tolerance', 0.95))
+
+        return run_test(executor, the_test, monitor)
+
+    def _visualized_points(self, the_test):
+        return self.road_points
+
+    def _reduce_oob_statistics(self):
+        # The same execution data is reduced only once, even if its outcome is recorded twice
+        if self._reduced_execution_data is self.execution_data:
+            return
+        self._reduced_execution_data = self.execution_data
+        self.oob_statistics = reduce_oob_states(self.execution_data)
+        if self.oob_statistics.state_count == 0:
+            # No states to reduce, the fitness falls back to the one of ERROR and INVALID tests instead of inf
+            log.warning("No execution data for test outcome %s, using a min OOB distance of 2.0", self.test_outcome)
+            self.max_oob_percentage = 0.0
+            self.min_oob_distance = 2.0
+            return
+        self.max_oob_percentage = self.oob_statistics.max_oob_percentage
+        self.min_oob_distance = self.oob_statistics.min_oob_distance
+        log.info("Collected %d states information. Max OOB percentage is %.3f, min OOB distance is %.3f", self.oob_statistics.state_count, self.max_oob_percentage, self.min_oob_distance)
+        log.info("First OOB at step %s, total OOB duration %.3f", self.oob_statistics.first_oob_step, self.oob_statistics.oob_duration)
+
+    def _record_outcome(self, individual, executor, the_test):
+        """Log, draw and write the outcome of the last executed test, returns its fitness (the min OOB distance).
+        """
+        log.info("test_outcome %s", self.test_outcome)
+        log.info("description %s", self.description)
+
+        if executor.road_visualizer:
+            # Draw the road and its OOB trace in the background instead of pausing the search
+            self.background_visualizer.submit(self._visualized_points(the_test), self.execution_data, self.test_outcome)
+
+        if self.test_outcome != 'ERROR' and self.test_outcome != 'INVALID':
+            self._reduce_oob_statistics()
+            #oob = self.max_oob_percentage
+            oob = self.min_oob_distance
+        else:
+            self.max_oob_percentage = 0.0
+            self.min_oob_distance = 2.0
+            #oob = self.max_oob_percentage
+            oob = self.min_oob_distance
+
+        self._csv_writer(individual)
+
+        log.info("Remaining Time: %s", str(executor.get_remaining_time()))
+        return oob
+
+    def _csv_writer(self, individual):
+        timestr = time.strftime("%d%m%Y-%H%M%S")
+        #writing failed testcases to csv file
+        if self.test_outcome != 'PASS' and self.test_outcome != 'ERROR' and self.test_outcome != 'INVALID':
+            self.result_files.write_failing([individual, self.road_points, self.test_outcome, self.description, timestr])
+            if self.archive is not None:
+                self._archive_failure(individual, timestr)
+        elif self.test_outcome != 'PASS':
+            self.max_oob_percentage = 0.0
+            self.min_oob_distance = 2
+
+        print("Max OOB percentage in last simulation: ", self.max_oob_percentage)
+        print("OOB distance in last simulation: ", self.min_oob_distance)
+
+        self.result_files.write_evaluation([self.min_oob_distance, self.max_oob_percentage, self.test_outcome, self.description, timestr])
+        self.test_count += 1
+        if self.trace_archive and self.execution_data and self.trace_archive.should_store(self.test_outcome, self.min_oob_distance):
+            self.trace_archive.add("test_{:06d}".format(self.test_count), self.execution_data)
+        if self.live_metrics:
+            self.live_metrics.update(self.test_outcome, getattr(self.road_points, 'interpolated_points', self.road_points))
+
+    def _archive_failure(self, individual, timestr):
+        # Only plain copies are archived, so neither the individual nor the execution data are kept alive by it
+        states = self.execution_data or []
+        trace = {'pos': np.array([state.pos[:2] for state in states], dtype=np.float32).reshape(-1, 2),
+                 'oob_percentage': np.array([state.oob_percentage for state in states], dtype=np.float32)}
+        self.archive.append({'kind': 'failure', 'individual': [list(coordinates) for coordinates in individual],
+                             'road_points': np.asarray(getattr(self.road_points, 'interpolated_points', self.road_points), dtype=np.float32),
+                             'description': self.description, 'min_oob_distance': self.min_oob_distance,
+                             'max_oob_percentage': self.max_oob_percentage, 'trace': trace, 'time': timestr})
+
+    def _close(self):
+        # Called when the generation ends, also when the executor stops it with a TimeoutError
+        if self.archive is not None:
+            self.archive.close()
+        self.background_visualizer.close()
+
+    def _produce_roads(self):
+        """List of (individual, road_points, the_test) ready to be executed, called by the producer thread.
+        """
+        raise NotImplementedError
+
+    def _execute_queued_road(self, executor, road):
+        # Runs in the worker thread of executor, only the bookkeeping of the results is serialized
+        individual, road_points, the_test = road
+        result = self._run_test(the_test, executor)
+
+        with self.result_lock:
+            self.road_points = road_points
+            self.test_outcome, self.description, self.execution_data = result
+            self._record_outcome(individual, executor, the_test)
+
+    def _start_queued(self):
+        log.info("Starting queued test generation on %d executors", len(self.executors))
+        for worker_nr, executor in enumerate(self.executors):
+            # Executors drawing random numbers themselves get a stream of their own
+            if hasattr(executor, 'rng'):
+                executor.rng = self.seeds.worker_generator(worker_nr)
+        run_workers(RoadQueue(self._produce_roads, queue_size=self.queue_size), self.executors, self._execute_queued_road)
+
+
+class BezierTestGeneratorBase(TestGeneratorBase):
+    def __init__(self, number_of_controlpoints=7, adaptive_resampling=False, **kwargs):
+        super().__init__(**kwargs)
+        self.number_of_controlpoints = number_of_controlpoints
+        self.step_size = int(self.map_size/self.number_of_controlpoints)
+        self.adaptive_resampling = adaptive_resampling
+        self.composite_road = None
+
+    def _bezier_calculation(self, control_point_set):
+        if self.composite_road:
+            # Only segments whose control points changed are evaluated again
+            return self.composite_road.bezier_set(control_point_set)
+
+        bezier_set = []
+
+        for i in range(0,len(control_point_set),2):
+            control_points = list(zip(control_point_set[i], control_point_set[i+1]))
+            if self.adaptive_resampling:
+                # Place the road points by arc length and curvature instead of uniformly in t
+                x_bezier, y_bezier = adaptive_bezier_points(control_points).T
+            else:
+                x_bezier, y_bezier = bezier_curve(control_points, np.linspace(0, 1, num=200)).T #max permissable number of roadpoints is 500
+            bezier_set.append(x_bezier)
+            bezier_set.append(y_bezier)
+
+        return bezier_set
+
+    def _road_points(self, bezier_set):
+        return list(zip(bezier_set[0], bezier_set[1]))
+
+    def _initial_controlpoints(self):
+        if self.composite_road:
+            # Segment by segment along the previous one, the whole map gives almost only invalid composite roads
+            control_point_set = self.composite_road.random_road((self.number_of_controlpoints - 1) // self.composite_road.degree, self.init_random)
+            if control_point_set is not None:
+                return control_point_set
+            control_point_set = random_control_points(self.map_size, self.number_of_controlpoints, self.step_size, self.init_random)
+            return enforce_c1(control_point_set, self.composite_road.degree)
+
+        return random_control_points(self.map_size, self.number_of_controlpoints, self.step_size, self.init_random)
@@ -0,0 +1,301 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Genetic algorithm shared by the GA-Bézier search variants.
+"""
+
+from collections import namedtuple
+import logging as log
+import os
+import numpy as np
+
+from deap import algorithms
+from deap import base
+from deap import creator
+from deap import tools
+
+from code_pipeline.tests_generation import RoadTestFactory
+
+from .array_population import ArrayPopulation, ea_simple_array
+from .adaptive_mutation import SuccessRuleStepSize
+from .async_pipeline import pipelined_map
+from .composite_bezier import CompositeBezierRoad, enforce_c1
+from .failure_archive import load_failing_individuals, warm_start_individuals
+from .failure_index import FailureIndex
+from .generator_base import BezierTestGeneratorBase
+from .multi_fidelity import FidelityScreen
+from .operators import control_point_mutation
+from .population_sampling import sample_valid_population
+
+
+# Road of an individual ready for its simulation, built without touching the generator's per test state
+PreparedTest = namedtuple('PreparedTest', ['bezier_set', 'road_points', 'the_test', 'duplicate_distance', 'is_valid', 'validation_msg', 'low_fidelity'])
+
+
+class RestartSearch(Exception):
+    """Raised by the evaluation of a failing test to abandon the running GA, start() begins a new one."""
+
+
+class GABETestGeneratorBase(BezierTestGeneratorBase):
+    # Search variants B and C restart the GA from a new population as soon as a test failed
+    restart_on_failure = False
+
+    def __init__(self, results_folder, pop_size=75, cxpb=0.8, mutpb=0.1, number_of_segments=None, array_population=False, batch_initialization=False, adaptive_resampling=False, failure_distance=None, penalize_duplicates=True, warm_start_archive=None, warm_start_fraction=0.5, pipelined_evaluation=False, adaptive_mutation=False, low_fidelity_threshold=None, calibration_rate=0.05, low_fidelity_executor=None, **kwargs):
+        super().__init__(adaptive_resampling=adaptive_resampling, **kwargs)
+        if number_of_segments:
+            # Road of C1-continuous cubic Bézier segments instead of a single Bézier curve of high degree
+            self.composite_road = CompositeBezierRoad(self.map_size)
+            self.number_of_controlpoints = self.composite_road.degree * number_of_segments + 1
+            self.step_size = int(self.map_size/self.number_of_controlpoints)
+        self.POP_SIZE = pop_size
+        self.NGEN = 100000
+        self.cxpb = cxpb
+        self.mutpb = mutpb
+        # The array backed population uses vectorized versions of the default operators
+        self.array_population = array_population and not number_of_segments
+        if array_population and number_of_segments:
+            log.warning("The array backed population is not available for composite roads")
+        self.batch_initialization = batch_initialization and not number_of_segments
+        if batch_initialization and number_of_segments:
+            log.warning("Batch initialization is not available for composite roads")
+        # Individuals closer than failure_distance (mean point distance in m) to a found failure are not simulated
+        self.failure_index = FailureIndex(failure_distance) if failure_distance else None
+        self.penalize_duplicates = penalize_duplicates
+        self.skipped_duplicates = 0
+        # Part of every initial population can be taken from failing individuals of earlier runs
+        self.warm_start_archive = load_failing_individuals(warm_start_archive, self.number_of_controlpoints) if warm_start_archive else []
+        self.warm_start_fraction = warm_start_fraction
+        # Overlap the geometry of the next individuals and the recording of the last one with the running simulation.
+        # A restart discards the simulations already run ahead, so the variants restarting on failure evaluate one by one.
+        self.pipelined_evaluation = pipelined_evaluation and not self.restart_on_failure
+        if pipelined_evaluation and self.restart_on_failure:
+            log.warning("Pipelined evaluation is not available for search variants restarting on failure")
+
+        creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
+        creator.create("Individual", list, fitness=creator.FitnessMin)
+
+        self.toolbox = base.Toolbox()
+        self.toolbox.register("individual", self._create_control_point_individual, creator.Individual)
+        self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
+        self.toolbox.register("evaluate", self._evaluate_control_point_individual)
+        self.toolbox.register("mate", tools.cxTwoPoint)
+        self.toolbox.register("mutate", self._control_point_mutation, indpb=0.5)
+        self.toolbox.register("select", tools.selTournament, tournsize=3)
+        if self.batch_initialization:
+            self.toolbox.register("population", self._sample_population)
+        if self.composite_road:
+            self.toolbox.register("mate", self.composite_road.crossover)
+            self.toolbox.register("mutate", self.composite_road.mutate, indpb=0.5, mutation_range=self.map_size/40, rng=self.mutation_random)
+        if self.pipelined_evaluation:
+            self.toolbox.register("map", self._pipelined_map)
+
+        configuration = "POP-{}_cxpb-{}_mutpb-{}".format(self.POP_SIZE, self.cxpb, self.mutpb)
+        self._setup_results(results_folder, "{}_{}".format(configuration, self.timestamp_id), configuration)
+
+        # The mutation range follows the success rate of the mutations instead of being fixed to map_size/40
+        self.mutation_step_size = None
+        if adaptive_mutation:
+            self.mutation_step_size = SuccessRuleStepSize(self.map_size, trajectory_path=os.path.join(self.csv_results_path, "mutation_step_size", self.unique_filename + '.csv'))
+            self.toolbox.register("mutate", self._adaptive_mutation, indpb=0.5)
+
+        # Roads are first driven by a kinematic model, only those getting closer than low_fidelity_threshold (m) to the
+        # lane border and a calibration sample of the others are simulated (by default the model of the MockExecutor)
+        self.fidelity_screen = None
+        if low_fidelity_threshold is not None:
+            self.fidelity_screen = FidelityScreen(low_fidelity_threshold, calibration_rate, self.seeds.python_random("fidelity"), low_fidelity_executor, log_path=os.path.join(self.csv_results_path, "fidelity_log", self.unique_filename + '.csv'))
+
+    def _population_validator(self):
+        # Optional check of the road points of sampled individuals in addition to the fast geometric one
+        return None
+
+    def _sample_population(self, n):
+        # Candidates are drawn and checked in vectorized batches until exactly n valid individuals are found
+        population = sample_valid_population(self.init_rng, n, self.map_size, self.number_of_controlpoints, self.step_size, validate=self._population_validator())
+
+        return [creator.Individual([coordinates.tolist() for coordinates in individual]) for individual in population]
+
+    def _create_control_point_individual(self,icls):
+
+        control_point_individual = self._initial_controlpoints()
+
+        return icls(control_point_individual)
+
+    def _evaluate_control_point_individual(self,individual):
+        prepared = self._prepare_test(individual)
+        return self._record_test(individual, prepared, self._execute_test(prepared))
+
+    def _prepare_test(self, individual):
+        bezier_set = self._bezier_calculation(individual)
+        road_points = self._road_points(bezier_set)
+
+        if self.failure_index is not None:
+            distance = self.failure_index.distance(road_points)
+            if distance < self.failure_index.threshold:
+                return PreparedTest(bezier_set, road_points, None, distance, False, "", None)
+
+        the_test = RoadTestFactory.create_road_test(road_points)
+
+        is_valid, validation_msg = True, ""
+        if self.composite_road:
+            # Only the segments changed since the last check are validated again, invalid roads are not simulated
+            is_valid, validation_msg = self.composite_road.validate(individual)
+
+        low_fidelity = None
+        if self.fidelity_screen is not None and is_valid:
+            low_fidelity = self.fidelity_screen.screen(the_test)
+
+        return PreparedTest(bezier_set, road_points, the_test, None, is_valid, validation_msg, low_fidelity)
+
+    def _check_time_budget(self):
+        # Only the executor stops the GA, roads never reaching it must not keep the search going past the budget
+        if self.executor.get_remaining_time() <= 0:
+            raise TimeoutError("Time budget used up")
+
+    def _execute_test(self, prepared):
+        if prepared.duplicate_distance is not None:
+            self._check_time_budget()
+            return None
+        if prepared.low_fidelity is not None and prepared.low_fidelity.promoted is None:
+            self._check_time_budget()
+            return None
+        if prepared.is_valid:
+            return self._run_test(prepared.the_test, self.executor)
+        self._check_time_budget()
+        return 'INVALID', prepared.validation_msg, []
+
+    def _record_test(self, individual, prepared, result):
+        if prepared.duplicate_distance is not None:
+            # A skipped duplicate tells nothing about the success of its mutation, it is not counted by the step size rule
+            individual.parent_fitness = None
+            individual.skipped_duplicate = True
+            return (self._duplicate_fitness(prepared.duplicate_distance)),
+        if result is None:
+            # Not simulated, the min OOB distance of the kinematic model is the fitness
+            self.fidelity_screen.record(prepared.low_fidelity)
+            if self.mutation_step_size is not None:
+                self._record_mutation(individual, prepared.low_fidelity.min_oob_distance)
+            return (prepared.low_fidelity.min_oob_distance),
+
+        self.bezier_set, self.road_points, the_test = prepared.bezier_set, prepared.road_points, prepared.the_test
+        self.test_outcome, self.description, self.execution_data = result
+
+        if prepared.low_fidelity is not None:
+            self._record_fidelity(prepared.low_fidelity)
+
+        if self.failure_index is not None and self.test_outcome == 'FAIL':
+            time_since_failure = self.failure_index.add(self.road_points)
+            log.info("Distinct failure nr %d found, %s s after the previous one", len(self.failure_index), time_since_failure)
+
+        if self.restart_on_failure and self.test_outcome == 'FAIL':
+            self._restart(individual, the_test)
+
+        fitness = self._record_outcome(individual, self.executor, the_test)
+        if self.mutation_step_size is not None:
+            self._record_mutation(individual, fitness)
+        return (fitness),
+
+    def _record_fidelity(self, low_fidelity):
+        min_oob_distance = None
+        if self.test_outcome == 'PASS' or self.test_outcome == 'FAIL':
+            self._reduce_oob_statistics()
+            min_oob_distance = self.min_oob_distance
+        self.fidelity_screen.record(low_fidelity, self.test_outcome, min_oob_distance)
+
+    def _pipelined_map(self, evaluate, individuals):
+        # Replaces toolbox.map, runs the stages of toolbox.evaluate (_evaluate_control_point_individual) overlapped
+        individuals = list(individuals)
+        return pipelined_map(self._prepare_test, self._execute_test, self._record_test, individuals)
+
+    def _duplicate_fitness(self, distance):
+        # Skipped near-duplicates get the fitness of an invalid road, penalized ones a worse one the closer they are
+        self.skipped_duplicates += 1
+        log.info("Skipped near-duplicate of a known failure (distance %.2f m), %d skipped so far", distance, self.skipped_duplicates)
+        if self.penalize_duplicates:
+            return 2.0 + (self.failure_index.threshold - distance)
+        return 2.0
+
+    def _restart(self, individual, the_test):
+        print("TESTCASE FAILED - RESTARTING GA")
+
+        self._record_outcome(individual, self.executor, the_test)
+
+        # RESTARTING THE GA
+        # Unwinds the running GA instead of nesting a new one inside this evaluation, so the populations, hall of fame
+        # and execution data of the abandoned searches are released
+        raise RestartSearch()
+
+    def _warm_start(self, pop):
+        k = min(int(self.warm_start_fraction * len(pop)), len(self.warm_start_archive))
+        if k == 0:
+            return pop
+        seeds = warm_start_individuals(self.warm_start_archive, k, self.map_size, self.init_rng, self.init_random)
+        if self.composite_road:
+            # The perturbation moves the handles independently, restore the C1 continuity at the junctions
+            for individual in seeds:
+                enforce_c1(individual, self.composite_road.degree)
+        log.info("Warm start with %d of %d individuals from the failure archive", k, len(pop))
+        return [creator.Individual(individual) for individual in seeds] + pop[k:]
+
+    def _control_point_mutation(self,individual, indpb):
+        return control_point_mutation(individual, indpb, self.map_size, self.mutation_random)
+
+    def _adaptive_mutation(self, individual, indpb):
+        # The fitness of the individual before the mutation, unknown if it was just crossed
+        individual.parent_fitness = individual.fitness.values[0] if individual.fitness.valid else None
+        if self.composite_road:
+            return self.composite_road.mutate(individual, indpb, mutation_range=self.mutation_step_size.mutation_range, rng=self.mutation_random)
+        return control_point_mutation(individual, indpb, self.map_size, self.mutation_random, self.mutation_step_size.mutation_range)
+
+    def _record_mutation(self, individual, fitness):
+        parent_fitness = getattr(individual, 'parent_fitness', None)
+        if parent_fitness is not None:
+            # Reset, the attribute is copied along with the individual into the next generation
+            individual.parent_fitness = None
+            self.mutation_step_size.record(parent_fitness, fitness)
+
+    def _archive_hall_of_fame(self):
+        if self.archive is not None and len(self.hof) > 0:
+            best = self.hof[0]
+            self.archive.append({'kind': 'hall_of_fame', 'individual': [list(coordinates) for coordinates in best], 'fitness': best.fitness.values})
+
+    def _geneticalgorithm(self):
+        pop = self._warm_start(self.toolbox.population(n=self.POP_SIZE))
+        hof = tools.HallOfFame(1)
+        # Kept by the generator, so the best individual of a search abandoned by a restart can still be archived
+        self.hof = hof
+        stats = tools.Statistics(lambda ind: ind.fitness.values)
+        stats.register("min", np.min)
+        stats.register("max", np.max)
+
+        if self.array_population:
+            # Selection and variation run vectorized on one (pop x 2 x N) array, statistics are computed on the fitness array
+            pop, logbook = ea_simple_array(ArrayPopulation.from_individuals(pop), self.toolbox.evaluate, creator.Individual, cxpb=self.cxpb, mutpb=self.mutpb, ngen=self.NGEN, map_size=self.map_size, rng=self.rng, stats=stats, halloffame=hof, verbose=True, map_function=self.toolbox.map, step_size=self.mutation_step_size)
+        else:
+            pop = algorithms.eaSimple(pop, self.toolbox, cxpb=self.cxpb, mutpb=self.mutpb, ngen=self.NGEN, stats=stats, halloffame=hof, verbose=True)
+
+        return hof
+
+    def start(self):
+
+        # Some debugging
+        log.info("Starting test generation. Remaining time %s", self.executor.get_remaining_time())
+
+        self.step_size = int(self.map_size/self.number_of_controlpoints)
+
+        try:
+            while True:
+                if not self.batch_initialization: # The sampled population of a restart already is the new starting point
+                    self.control_point_set = self._initial_controlpoints()
+                try:
+                    self.hof = self._geneticalgorithm()
+                    restarted = False
+                except RestartSearch:
+                    restarted = True
+                self._archive_hall_of_fame()
+                if not restarted or self.executor.get_remaining_time() <= 0:
+                    break
+        finally:
+            # The executor ends the search with a TimeoutError at the end of the time budget
+            self._close()
@@ -0,0 +1,130 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Campaign metrics of a running test generator, updated after every test and written to a small status file that is
+replaced atomically, so it can be watched (or scraped) while a sweep is running. The metrics follow the columns of
+the master CSVs: P(fail) is the share of failing tests, TTF the number of tests up to the first failure. Sparseness
+is the mean pairwise distance of the failing roads (mean distance of their points after resampling by arc length),
+Fréchet their mean pairwise discrete Fréchet distance. Both are updated with the distances of each new failure to the
+previous ones only, and only to the last comparisons failures, so the cost per failure stays bounded in long campaigns
+with thousands of failures. They are therefore reported as recent_sparseness and recent_frechet, together with the
+comparison window and the number of points the roads are resampled to, and are not the campaign-wide values of the
+master CSVs.
+"""
+
+from collections import deque
+from functools import lru_cache
+import json
+import os
+import time
+import numpy as np
+
+from .failure_index import polyline_features
+
+
+@lru_cache(maxsize=8)
+def _anti_diagonals(n, m):
+    # Slices of the cells of each anti-diagonal of a flattened n x m matrix and of their upper, upper left and left
+    # neighbours, all of step m - 1
+    diagonals = []
+    for d in range(2, n + m - 1):
+        first, last = max(1, d - m + 1), min(n - 1, d - 1)
+        if first > last:
+            continue
+        start, stop = d + first * (m - 1), d + last * (m - 1) + 1
+        diagonals.append(tuple(slice(start - offset, stop - offset, m - 1) for offset in (0, m, m + 1, 1)))
+    return diagonals
+
+
+def _discrete_frechet(p, qs):
+    # Dynamic programming over the couplings of p with each polyline of qs (k x m x 2), one anti-diagonal at a time as
+    # each only depends on the previous two
+    distance = np.hypot(p[np.newaxis, :, np.newaxis, 0] - qs[:, np.newaxis, :, 0], p[np.newaxis, :, np.newaxis, 1] - qs[:, np.newaxis, :, 1])
+    coupling = np.empty_like(distance)
+    coupling[:, :, 0] = np.maximum.accumulate(distance[:, :, 0], axis=1)
+    coupling[:, 0, :] = np.maximum.accumulate(distance[:, 0, :], axis=1)
+    k, n, m = distance.shape
+    distance, coupling = distance.reshape(k, n * m), coupling.reshape(k, n * m)
+    for cells, up, diagonal, left in _anti_diagonals(n, m):
+        previous = np.minimum(coupling[:, up], coupling[:, diagonal])
+        np.minimum(previous, coupling[:, left], out=previous)
+        coupling[:, cells] = np.maximum(previous, distance[:, cells])
+    return coupling[:, -1]
+
+
+class LiveMetrics():
+    def __init__(self, filepath, num=32, comparisons=50):
+        self.filepath = filepath
+        self.num = num
+        self.comparisons = comparisons
+        self.start_time = time.time()
+        self.counts = {'PASS': 0, 'FAIL': 0, 'INVALID': 0, 'ERROR': 0}
+        self.tests = 0
+        self.tests_to_first_failure = None
+        self.last_failure_time = None
+        # Failing roads a new failure is compared with
+        self.failures = deque(maxlen=comparisons)
+        self.pair_count = 0
+        self.sparseness_sum = 0.0
+        self.frechet_sum = 0.0
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+
+    def _add_failure(self, road_points):
+        features = polyline_features(road_points, self.num)
+        points = features.reshape(2, self.num).T
+        if self.failures:
+            previous = np.array(self.failures)
+            self.sparseness_sum += float(np.sum(np.mean(np.linalg.norm(previous - points, axis=2), axis=1)))
+            self.frechet_sum += float(np.sum(_discrete_frechet(points, previous)))
+            self.pair_count += len(previous)
+        self.failures.append(points)
+
+    def update(self, test_outcome, road_points=None):
+        self.tests += 1
+        self.counts[test_outcome] = self.counts.get(test_outcome, 0) + 1
+        if test_outcome == 'FAIL':
+            self.last_failure_time = time.time()
+            if self.tests_to_first_failure is None:
+                self.tests_to_first_failure = self.tests
+            if road_points is not None and len(road_points) > 1:
+                self._add_failure(road_points)
+        self.write()
+
+    def metrics(self):
+        now = time.time()
+        elapsed = now - self.start_time
+        return {'tests': self.tests,
+                'passed': self.counts['PASS'],
+                'failed': self.counts['FAIL'],
+                'invalid': self.counts['INVALID'],
+                'errors': self.counts['ERROR'],
+                'p_fail': round(self.counts['FAIL'] / self.tests, 3) if self.tests else None,
+                'invalid_rate': round(self.counts['INVALID'] / self.tests, 3) if self.tests else None,
+                'tests_per_minute': round(60.0 * self.tests / elapsed, 2) if elapsed > 0 else None,
+                'ttf': self.tests_to_first_failure,
+                'seconds_since_last_failure': round(now - self.last_failure_time, 1) if self.last_failure_time else None,
+                'recent_sparseness': round(self.sparseness_sum / self.pair_count, 3) if self.pair_count else None,
+                'recent_frechet': round(self.frechet_sum / self.pair_count, 3) if self.pair_count else None,
+                'comparison_window': self.comparisons,
+                'resample_points': self.num,
+                'elapsed_seconds': round(elapsed, 1),
+                'updated': time.strftime("%d%m%Y-%H%M%S", time.localtime(now))}
+
+    def _prometheus_text(self, metrics):
+        lines = []
+        for name, value in metrics.items():
+            if isinstance(value, (int, float)):
+                lines.append("gabe_{} {}".format(name, value))
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Write the metrics as JSON, or in the Prometheus text format for a .prom file, replacing the file atomically.
+        """
+        metrics = self.metrics()
+        content = self._prometheus_text(metrics) if self.filepath.endswith('.prom') else json.dumps(metrics, indent=2)
+        temporary_path = self.filepath + '.tmp'
+        with open(temporary_path, mode='w') as file:
+            file.write(content)
+        os.replace(temporary_path, self.filepath)
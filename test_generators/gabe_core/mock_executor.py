@@ -0,0 +1,143 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Mock executor that drives a simple kinematic vehicle along the road instead of running BeamNG.tech. It implements the
+executor interface used by the test generators (execute_test, get_remaining_time, road_visualizer) as well as the
+streaming interface execute_test_streaming(the_test, on_state).
+
+As the driver of the simulator, the vehicle starts from standstill and slows down for the sharpest curve within
+preview_distance so its lateral acceleration stays below max_lateral_acceleration, but it can only brake with
+max_deceleration. Roads fail where a sharp curve follows too soon to brake for it. With the defaults about 1% of the
+valid random Bézier roads of a 200 m map fail, and the min OOB distances spread like those of the Bézier random
+runs in empirical_evaluation_results.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+from .streaming_execution import _arc_length, _signed_curvature
+
+SimulationDataRecord = namedtuple('SimulationDataRecord', ['timer', 'pos', 'dir', 'vel', 'vel_kmh', 'is_oob', 'oob_counter',
+                                                           'max_oob_percentage', 'oob_distance', 'oob_percentage'])
+
+
+def _road_points_of(the_test):
+    # RoadTest objects of the code pipeline carry the interpolated road the vehicle drives on
+    for attribute in ('interpolated_points', 'road_points'):
+        points = getattr(the_test, attribute, None)
+        if points is not None:
+            return np.asarray(points, dtype=float)[:, :2]
+    return np.asarray(the_test, dtype=float)[:, :2]
+
+
+class MockExecutor():
+    def __init__(self, time_budget=3600, speed=70/3.6, time_step=0.25, setup_time=0.0, oob_tolerance=0.95,
+                 lane_width=4.0, car_width=1.8, drift_gain=0.35, response_time=1.0, max_lateral_acceleration=4.0,
+                 preview_distance=20.0, max_deceleration=2.5, max_acceleration=2.0):
+
+        self.time_budget = time_budget
+        self.speed = speed # Maximum speed, the vehicle slows down for curves
+        self.max_lateral_acceleration = max_lateral_acceleration
+        self.preview_distance = preview_distance
+        self.max_deceleration = max_deceleration
+        self.max_acceleration = max_acceleration
+        self.time_step = time_step
+        self.setup_time = setup_time
+        self.oob_tolerance = oob_tolerance
+        self.lane_width = lane_width
+        self.car_width = car_width
+        self.drift_gain = drift_gain # Lateral offset per unit of lateral acceleration, i.e. how much the car cuts corners
+        self.response_time = response_time
+        self.road_visualizer = None
+        self.elapsed_time = 0.0
+        self.test_count = 0
+
+    def get_remaining_time(self):
+        return max(0.0, self.time_budget - self.elapsed_time)
+
+    def _next_speed(self, speed, curvature_ahead):
+        # Speed keeping the lateral acceleration in the sharpest curve ahead below the limit, reached with bounded braking
+        target_speed = self.speed
+        max_curvature = float(curvature_ahead.max()) if len(curvature_ahead) else 0.0
+        if max_curvature > 0:
+            target_speed = min(target_speed, np.sqrt(self.max_lateral_acceleration / max_curvature))
+        if speed > target_speed:
+            return max(target_speed, speed - self.max_deceleration * self.time_step)
+        return min(target_speed, speed + self.max_acceleration * self.time_step)
+
+    def execute_test(self, the_test):
+        return self.execute_test_streaming(the_test, None)
+
+    def execute_test_streaming(self, the_test, on_state):
+        if self.get_remaining_time() <= 0:
+            # As the executors of the code pipeline, the GA variants only stop when the executor refuses further tests
+            raise TimeoutError("Time budget of the mock executor used up")
+
+        self.test_count += 1
+        self.elapsed_time += self.setup_time
+
+        road_points = _road_points_of(the_test)
+        if len(road_points) < 2:
+            return 'INVALID', "Not enough road points", []
+
+        arc_length = _arc_length(road_points)
+        curvature = _signed_curvature(road_points)
+        absolute_curvature = np.abs(curvature)
+        tangents = np.gradient(road_points, axis=0)
+        tangents /= np.maximum(np.linalg.norm(tangents, axis=1), 1e-9)[:, np.newaxis]
+        normals = np.stack((-tangents[:, 1], tangents[:, 0]), axis=1)
+
+        lane_half_width = self.lane_width / 2
+        car_half_width = self.car_width / 2
+        alpha = min(1.0, self.time_step / self.response_time)
+
+        execution_data = []
+        offset = 0.0
+        oob_counter = 0
+        max_oob_percentage = 0.0
+        was_oob = False
+        s = 0.0
+        speed = 0.0
+        timer = 0.0
+        while s <= arc_length[-1]:
+            kappa = np.interp(s, arc_length, curvature)
+            ahead = slice(np.searchsorted(arc_length, s), np.searchsorted(arc_length, s + self.preview_distance, side='right'))
+            speed = self._next_speed(speed, absolute_curvature[ahead])
+            # The vehicle drifts towards the outside of the curve proportionally to the lateral acceleration
+            offset += alpha * (-self.drift_gain * speed ** 2 * kappa - offset)
+
+            center = np.array([np.interp(s, arc_length, road_points[:, 0]), np.interp(s, arc_length, road_points[:, 1])])
+            index = min(int(np.searchsorted(arc_length, s)), len(road_points) - 1)
+            pos = center + offset * normals[index]
+
+            oob_distance = lane_half_width - abs(offset)
+            oob_percentage = float(np.clip((abs(offset) + car_half_width - lane_half_width) / self.car_width, 0.0, 1.0))
+            is_oob = oob_distance < car_half_width
+            if is_oob and not was_oob:
+                oob_counter += 1
+            was_oob = is_oob
+            max_oob_percentage = max(max_oob_percentage, oob_percentage)
+
+            state = SimulationDataRecord(timer=timer, pos=(pos[0], pos[1], 0.0), dir=(tangents[index][0], tangents[index][1], 0.0),
+                                         vel=(tangents[index][0] * speed, tangents[index][1] * speed, 0.0),
+                                         vel_kmh=speed * 3.6, is_oob=is_oob, oob_counter=oob_counter,
+                                         max_oob_percentage=max_oob_percentage, oob_distance=oob_distance,
+                                         oob_percentage=oob_percentage)
+            execution_data.append(state)
+            self.elapsed_time += self.time_step
+
+            if on_state is not None:
+                stop = on_state(state)
+                if stop is not None:
+                    test_outcome, description = stop
+                    return test_outcome, description, execution_data
+
+            if oob_percentage > self.oob_tolerance:
+                return 'FAIL', "Car drove out of the lane", execution_data
+
+            s += speed * self.time_step
+            timer += self.time_step
+
+        return 'PASS', "Successful test", execution_data
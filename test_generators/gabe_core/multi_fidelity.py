@@ -0,0 +1,97 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Two level evaluation of roads. Every road is first driven by the kinematic model of the MockExecutor, which takes
+milliseconds. Only roads the model fails on or drives closer than threshold meters to the lane border, and a random
+sample of the others to calibrate the model, are simulated by the executor. The others keep the min OOB distance of
+the model as their fitness. Every evaluation is logged with its fidelity level.
+
+The calibration samples are an unbiased sample of the screened out roads. Once there are enough of them, the
+threshold is set such that a road the model drives at the threshold fails in the simulation only with probability
+quantile, given the differences between the simulated and the modelled min OOB distances seen so far.
+"""
+
+from collections import namedtuple
+import csv
+import logging as log
+import os
+import random
+import time
+import numpy as np
+
+from .mock_executor import MockExecutor
+from .oob_statistics import reduce_oob_states
+
+
+# promoted is None for roads evaluated by the kinematic model only, otherwise the reason of the simulation
+LowFidelityResult = namedtuple('LowFidelityResult', ['test_outcome', 'min_oob_distance', 'promoted'])
+
+FIDELITY_LOG_HEADER = ['fidelity', 'promoted', 'low_fidelity_outcome', 'low_fidelity_min_oob_distance', 'test_outcome', 'min_oob_distance', 'time']
+
+
+class FidelityScreen():
+    def __init__(self, threshold, calibration_rate=0.05, rng=random, low_fidelity_executor=None, log_path=None, quantile=0.05, min_calibration_samples=20):
+        self.threshold = threshold
+        self.calibration_rate = calibration_rate
+        self.rng = rng
+        self.low_fidelity_executor = low_fidelity_executor or MockExecutor(time_budget=float('inf'))
+        self.quantile = quantile
+        self.min_calibration_samples = min_calibration_samples
+        # min OOB distance below which the OOB percentage exceeds the tolerance, i.e. the test fails
+        car_width = getattr(self.low_fidelity_executor, 'car_width', 1.8)
+        self.failure_distance = car_width * (0.5 - getattr(self.low_fidelity_executor, 'oob_tolerance', 0.95))
+        # Simulated minus modelled min OOB distance of the calibration samples
+        self.residuals = []
+        self.counts = {'low': 0, 'high': 0}
+        self.missed_failures = 0
+        self.log_path = log_path
+        if self.log_path:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with open(self.log_path, mode='w', newline='') as file:
+                csv.writer(file).writerow(FIDELITY_LOG_HEADER)
+
+    def screen(self, the_test):
+        """Drive the_test with the kinematic model and decide whether it is simulated by the executor.
+        """
+        test_outcome, description, execution_data = self.low_fidelity_executor.execute_test(the_test)
+        if not execution_data:
+            # Nothing to judge the road by, the executor decides
+            return LowFidelityResult(test_outcome, None, 'no_states')
+        min_oob_distance = reduce_oob_states(execution_data).min_oob_distance
+        if test_outcome == 'FAIL' or min_oob_distance < self.threshold:
+            return LowFidelityResult(test_outcome, min_oob_distance, 'candidate')
+        if self.rng.random() < self.calibration_rate:
+            return LowFidelityResult(test_outcome, min_oob_distance, 'calibration')
+        return LowFidelityResult(test_outcome, min_oob_distance, None)
+
+    def record(self, low_fidelity, test_outcome=None, min_oob_distance=None):
+        """Log an evaluation, with the outcome of the executor if the road was simulated.
+        """
+        fidelity = 'low' if low_fidelity.promoted is None else 'high'
+        self.counts[fidelity] += 1
+        if low_fidelity.promoted == 'calibration' and test_outcome == 'FAIL':
+            # A failure the threshold would have hidden, the threshold is likely too low
+            self.missed_failures += 1
+            log.warning("Calibration sample failed in the simulation although the kinematic model kept %.2f m to the lane border, %d such failures so far",
+                        low_fidelity.min_oob_distance, self.missed_failures)
+        if low_fidelity.promoted == 'calibration' and min_oob_distance is not None:
+            self.residuals.append(min_oob_distance - low_fidelity.min_oob_distance)
+            self._calibrate()
+        if self.log_path:
+            with open(self.log_path, mode='a', newline='') as file:
+                csv.writer(file).writerow([fidelity, low_fidelity.promoted or '', low_fidelity.test_outcome, low_fidelity.min_oob_distance,
+                                           test_outcome or '', '' if min_oob_distance is None else min_oob_distance, time.strftime("%d%m%Y-%H%M%S")])
+        log.info("Evaluated with %s fidelity, %d low and %d high fidelity evaluations so far", fidelity, self.counts['low'], self.counts['high'])
+        evaluations = self.counts['low'] + self.counts['high']
+        if evaluations == 100 and self.counts['high'] > 0.9 * evaluations:
+            log.warning("%d of the first %d roads were simulated, the kinematic model screens out hardly any road", self.counts['high'], evaluations)
+
+    def _calibrate(self):
+        if len(self.residuals) < self.min_calibration_samples:
+            return
+        threshold = self.failure_distance - float(np.quantile(self.residuals, self.quantile))
+        if abs(threshold - self.threshold) > 0.01:
+            log.info("Low fidelity threshold calibrated from %.2f m to %.2f m with %d samples", self.threshold, threshold, len(self.residuals))
+        self.threshold = threshold
@@ -0,0 +1,93 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Single pass reduction of the OOB information contained in the execution data of a test.
+"""
+
+import numpy as np
+
+
+def _is_oob(state):
+    is_oob = getattr(state, 'is_oob', None)
+    if is_oob is None:
+        return state.oob_percentage > 0.0
+    return bool(is_oob)
+
+
+class OOBStatistics():
+    """OOB statistics of a single test, updated state by state.
+
+    Besides min_oob_distance and max_oob_percentage it keeps the time step (and simulation time) at which the vehicle
+    left the lane for the first time and the total time the vehicle spent out of the lane.
+    """
+    def __init__(self):
+        self.state_count = 0
+        self.min_oob_distance = float('inf')
+        self.max_oob_percentage = 0.0
+        self.first_oob_step = None
+        self.first_oob_time = None
+        self.oob_duration = 0.0
+        self._last_timer = None
+        self._last_is_oob = False
+
+    def update(self, state):
+        if state.oob_distance < self.min_oob_distance:
+            self.min_oob_distance = state.oob_distance
+        if state.oob_percentage > self.max_oob_percentage:
+            self.max_oob_percentage = state.oob_percentage
+
+        timer = getattr(state, 'timer', self.state_count)
+        # The time between two states is attributed to the OOB duration if the vehicle was out of the lane at its start
+        if self._last_is_oob:
+            self.oob_duration += timer - self._last_timer
+
+        is_oob = _is_oob(state)
+        if is_oob and self.first_oob_step is None:
+            self.first_oob_step = self.state_count
+            self.first_oob_time = timer
+
+        self._last_timer = timer
+        self._last_is_oob = is_oob
+        self.state_count += 1
+
+    def __repr__(self):
+        return "OOBStatistics(states={}, min_oob_distance={:.3f}, max_oob_percentage={:.3f}, first_oob_step={}, oob_duration={:.3f})".format(
+            self.state_count, self.min_oob_distance, self.max_oob_percentage, self.first_oob_step, self.oob_duration)
+
+
+def reduce_oob_states(states):
+    """Reduce an iterable of simulation states to its OOBStatistics in one sweep.
+    """
+    statistics = OOBStatistics()
+    for state in states:
+        statistics.update(state)
+
+    return statistics
+
+
+def reduce_oob_columns(oob_distance, oob_percentage, is_oob=None, timer=None):
+    """Same reduction as reduce_oob_states, computed on columnar numpy arrays of the states.
+    """
+    oob_distance = np.asarray(oob_distance, dtype=float)
+    oob_percentage = np.asarray(oob_percentage, dtype=float)
+    is_oob = oob_percentage > 0.0 if is_oob is None else np.asarray(is_oob, dtype=bool)
+    timer = np.arange(len(oob_distance), dtype=float) if timer is None else np.asarray(timer, dtype=float)
+
+    statistics = OOBStatistics()
+    statistics.state_count = len(oob_distance)
+    if statistics.state_count == 0:
+        return statistics
+
+    statistics.min_oob_distance = float(oob_distance.min())
+    statistics.max_oob_percentage = max(0.0, float(oob_percentage.max()))
+    oob_steps = np.flatnonzero(is_oob)
+    if len(oob_steps) > 0:
+        statistics.first_oob_step = int(oob_steps[0])
+        statistics.first_oob_time = float(timer[oob_steps[0]])
+    statistics.oob_duration = float(np.sum(np.diff(timer) * is_oob[:-1]))
+    statistics._last_timer = float(timer[-1])
+    statistics._last_is_oob = bool(is_oob[-1])
+
+    return statistics
@@ -0,0 +1,64 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Creation and mutation of single Bézier control point individuals [xs, ys].
+"""
+
+import random
+
+
+def random_control_points(map_size, number_of_controlpoints, step_size, rng=random):
+    """Random control point set [xs, ys] with cp_0 around the middle of the lower map border.
+    """
+    x_control_points = []
+    y_control_points = []
+    for cp in range(number_of_controlpoints):
+
+        if cp == 0: # Fixed coordinates for cp_0
+            x_cp = rng.uniform(((map_size/2)-(map_size/10)), ((map_size/2)+(map_size/10))) # Set first Control Point in x direction in range around map middle
+            y_cp = (map_size/40) # y_cp slightly above map-boundary
+        else:
+            x_cp = rng.randint(10, map_size-5)
+            y_cp = cp * step_size
+
+        x_control_points.append(x_cp)
+        y_control_points.append(y_cp)
+
+    return [x_control_points, y_control_points]
+
+
+def _mutate_value(value, mutation_range, map_size, rng, max_guesses=1000):
+    # Move value up or down by at most mutation_range, redrawing the step while the new value leaves the map
+    if rng.uniform(0, 1) > 0.5: # Increase value during mutation
+        direction, outside = 1, lambda new_value: new_value >= map_size
+    else: # Decrease value during mutation
+        direction, outside = -1, lambda new_value: new_value <= 0
+
+    new_value = value + direction * rng.uniform(0, mutation_range)
+    guess_cnt = 0
+    while outside(new_value):
+        guess_cnt += 1
+        new_value = value + direction * rng.uniform(0, mutation_range)
+        if guess_cnt > max_guesses:
+            # old value as new individual value when max guesses are made
+            new_value = value
+
+    return new_value
+
+
+def control_point_mutation(individual, indpb, map_size, rng=random, mutation_range=None):
+    """Mutate every inner control point with probability indpb within a range of map_size/40 (or mutation_range)
+    around its old value.
+    """
+    cpx_mutation_range = (map_size/40) if mutation_range is None else mutation_range # Mutate cpx within range (dep. on mapsize) around old value
+    cpy_mutation_range = (map_size/40) if mutation_range is None else mutation_range # Mutate cpy within range (dep. on mapsize) around old value
+
+    # Neither the first nor the last control point is mutated to avoid map boundary violations
+    for cp in range(1, len(individual[0]) - 1):
+        if rng.uniform(0, 1) < indpb: # Check independent probability for every chromosom (controlpoint) pair
+            individual[0][cp] = _mutate_value(individual[0][cp], cpx_mutation_range, map_size, rng)
+            individual[1][cp] = _mutate_value(individual[1][cp], cpy_mutation_range, map_size, rng)
+
+    return (individual),
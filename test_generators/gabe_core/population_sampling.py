@@ -0,0 +1,130 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Batched sampling of initial control point sets. Candidates are drawn with the same distribution as the generators'
+_initial_controlpoints, evaluated as a batch of Bézier curves and filtered by a fast geometric validity check until the
+requested number of valid control point sets is reached.
+
+The same check pre-filters the three random points of the tool competition's random generator: the pipeline
+interpolates them by a quadratic spline, which is a quadratic Bézier curve.
+"""
+
+import logging as log
+import numpy as np
+
+from .bezier_geometry import bezier_curve, MIN_RADIUS
+from .road_features import road_features
+
+
+def sample_control_points(rng, n, map_size, number_of_controlpoints, step_size):
+    """Draw n control point sets as an (n, 2, N) array.
+
+    cp_0 lies around the middle of the lower map border, every following control point gets a random x and the fixed
+    y = cp * step_size.
+    """
+    xs = rng.integers(10, map_size - 5, size=(n, number_of_controlpoints), endpoint=True).astype(float)
+    xs[:, 0] = rng.uniform((map_size / 2) - (map_size / 10), (map_size / 2) + (map_size / 10), size=n)
+    ys = np.tile(np.arange(number_of_controlpoints, dtype=float) * step_size, (n, 1))
+    ys[:, 0] = map_size / 40
+
+    return np.stack((xs, ys), axis=1)
+
+
+def _self_intersecting(curves):
+    # Proper crossings between any two non-adjacent line pieces of each polyline, for a whole batch at once
+    a, b = curves[:, :-1, np.newaxis], curves[:, 1:, np.newaxis]
+    c, d = curves[:, np.newaxis, :-1], curves[:, np.newaxis, 1:]
+
+    def orientation(u, v, w):
+        return (v[..., 0] - u[..., 0]) * (w[..., 1] - u[..., 1]) - (v[..., 1] - u[..., 1]) * (w[..., 0] - u[..., 0])
+
+    crossing = (orientation(a, b, c) * orientation(a, b, d) < 0) & (orientation(c, d, a) * orientation(c, d, b) < 0)
+    pieces = curves.shape[1] - 1
+    non_adjacent = np.abs(np.arange(pieces)[:, np.newaxis] - np.arange(pieces)[np.newaxis, :]) > 1
+    return np.any(crossing & non_adjacent, axis=(1, 2))
+
+
+def fast_validity_check(control_points, map_size, min_radius=MIN_RADIUS, map_margin=4, num=50):
+    """Geometric validity of a batch of single Bézier roads (n, 2, N) as a boolean array.
+
+    A road is rejected if it (including half of the road width) leaves the map, if its analytic curvature exceeds
+    the one of min_radius (the limit of the code pipeline's "too sharp" check) or if it intersects itself.
+    """
+    points = np.swapaxes(np.asarray(control_points, dtype=float), 1, 2)
+    t = np.linspace(0, 1, num=num)
+    curves = bezier_curve(points, t)
+
+    inside = np.all((curves >= map_margin) & (curves <= map_size - map_margin), axis=(1, 2))
+    not_too_sharp = road_features(points, num=num)['min_radius'] >= min_radius
+    valid = inside & not_too_sharp
+    if np.any(valid):
+        valid[valid] = ~_self_intersecting(curves[valid])
+
+    return valid
+
+
+def sample_valid_population(rng, pop_size, map_size, number_of_controlpoints, step_size, validate=None, batch_size=None, max_rounds=1000):
+    """Draw exactly pop_size control point sets (pop_size, 2, N) that pass the fast validity check.
+
+    Candidates are drawn in batches, the batch size adapts to the acceptance rate observed so far. validate is an
+    optional, more expensive check (e.g. the pipeline's TestValidator) applied only to the geometric survivors, it
+    receives the road points of a single candidate.
+    """
+    batch_size = batch_size or 2 * pop_size
+    accepted = []
+    drawn = valid_count = 0
+    for round_nr in range(max_rounds):
+        candidates = sample_control_points(rng, batch_size, map_size, number_of_controlpoints, step_size)
+        valid = fast_validity_check(candidates, map_size)
+        if validate is not None:
+            roads = bezier_curve(np.swapaxes(candidates[valid], 1, 2), np.linspace(0, 1, num=200))
+            valid[valid] = [bool(validate([tuple(p) for p in road])) for road in roads]
+
+        drawn += batch_size
+        valid_count += int(valid.sum())
+        accepted.extend(candidates[valid])
+        if len(accepted) >= pop_size:
+            log.info("Sampled %d valid individuals from %d candidates in %d rounds", pop_size, drawn, round_nr + 1)
+            return np.array(accepted[:pop_size])
+
+        missing = pop_size - len(accepted)
+        acceptance = max(valid_count / drawn, 0.01)
+        batch_size = int(min(max(missing / acceptance * 1.2, pop_size), 50 * pop_size))
+
+    raise RuntimeError("Could not sample {} valid individuals within {} rounds ({} candidates drawn)".format(pop_size, max_rounds, drawn))
+
+
+def interpolation_control_points(road_points):
+    """Quadratic Bézier control points (n, 3, 2) of the pipeline's interpolation of a batch of 3-point roads (n, 3, 2).
+
+    For three points the pipeline's splprep call (k=2, no smoothing) is the quadratic through them, parameterized by the
+    normalized chord length u of the middle point. Its middle Bézier control point follows from
+    P(u) = (1-u)^2 B0 + 2u(1-u) B1 + u^2 B2. Roads with coinciding points get NaN control points.
+    """
+    road_points = np.asarray(road_points, dtype=float)
+    first, middle, last = road_points[:, 0], road_points[:, 1], road_points[:, 2]
+    d1 = np.linalg.norm(middle - first, axis=1)
+    d2 = np.linalg.norm(last - middle, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = (d1 / (d1 + d2))[:, np.newaxis]
+        handle = (middle - (1 - u) ** 2 * first - u ** 2 * last) / (2 * u * (1 - u))
+
+    return np.stack((first, handle, last), axis=1)
+
+
+def fast_interpolation_validity_check(road_points, map_size, min_length=20.0, **kwargs):
+    """Boolean array of the 3-point roads (n, 3, 2) whose interpolated road passes the fast validity check.
+
+    Roads shorter than min_length are rejected as trivial, the remaining keyword arguments are the ones of
+    fast_validity_check.
+    """
+    control_points = interpolation_control_points(road_points)
+    valid = np.all(np.isfinite(control_points), axis=(1, 2))
+    if np.any(valid):
+        curves = bezier_curve(control_points[valid], np.linspace(0, 1, num=50))
+        long_enough = np.sum(np.linalg.norm(np.diff(curves, axis=1), axis=2), axis=1) >= min_length
+        valid[valid] = long_enough & fast_validity_check(np.swapaxes(control_points[valid], 1, 2), map_size, **kwargs)
+
+    return valid
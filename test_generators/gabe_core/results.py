@@ -0,0 +1,73 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+CSV result files of a test run: the evaluation of every executed test and the failing test cases.
+
+Run numbers are claimed in a registry folder by creating a file per number exclusively, so concurrent runs of the same
+configuration on one results tree never get the same number. A claimed number is not given out again, even if its
+run crashed.
+"""
+
+import csv
+import json
+import os
+import socket
+import time
+
+
+FAILING_TC_HEADER = ["individual", "road_points", "test_outcome", "description", "timestamp"]
+EVALUATION_HEADER = ["min_oob_distance", "max_oob_percentage", "test_outcome", "description", "timestamp"]
+
+
+class ResultFiles():
+    def __init__(self, csv_results_path, run_name, sub_folder=None):
+        self.csv_results_path = csv_results_path
+        sub_folders = [sub_folder] if sub_folder else []
+        self.evaluation_folder_path = os.path.join(self.csv_results_path, "results_test_runs", *sub_folders)
+        self.failing_TC_folder_path = os.path.join(self.csv_results_path, "failing_TC", *sub_folders)
+
+        for folder_path in (self.evaluation_folder_path, self.failing_TC_folder_path):
+            try:
+                os.makedirs(folder_path, exist_ok=True)
+            except OSError as error:
+                print("Directory '{}' can not be created".format(folder_path))
+
+        self.registry_folder_path = os.path.join(self.csv_results_path, "run_registry", *sub_folders)
+        run_nr = self._claim_run_nr(run_name)
+
+        self.unique_filename = '{}-RUN_{}'.format(run_nr, run_name)
+
+        self.csv_failing_filepath = os.path.join(self.failing_TC_folder_path, self.unique_filename + '.csv')
+        with open(self.csv_failing_filepath, mode='w', newline='') as file:
+            csv.writer(file, delimiter=',').writerow(FAILING_TC_HEADER)
+
+        self.csv_eval_filepath = os.path.join(self.evaluation_folder_path, self.unique_filename + '.csv')
+        with open(self.csv_eval_filepath, mode='a', newline='') as file:
+            csv.writer(file, delimiter=',').writerow(EVALUATION_HEADER)
+
+    def _claim_run_nr(self, run_name):
+        os.makedirs(self.registry_folder_path, exist_ok=True)
+        # Numbers of runs written before the registry existed are skipped as well
+        used = {name.split('-RUN_')[0] for name in os.listdir(self.evaluation_folder_path)}
+        run_nr = len(os.listdir(self.evaluation_folder_path))
+        while True:
+            if str(run_nr) not in used:
+                try:
+                    descriptor = os.open(os.path.join(self.registry_folder_path, str(run_nr)), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                except FileExistsError:
+                    pass
+                else:
+                    with os.fdopen(descriptor, mode='w') as file:
+                        json.dump({'run_name': run_name, 'host': socket.gethostname(), 'pid': os.getpid(), 'claimed': time.strftime("%d%m%Y-%H%M%S")}, file)
+                    return run_nr
+            run_nr += 1
+
+    def write_failing(self, row):
+        with open(self.csv_failing_filepath, mode='a', newline='') as file:
+            csv.writer(file, delimiter=',').writerow(row)
+
+    def write_evaluation(self, row):
+        with open(self.csv_eval_filepath, mode='a', newline='') as file:
+            csv.writer(file, delimiter=',').writerow(row)
@@ -0,0 +1,101 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Road difficulty features of Bézier roads computed from the control points. The derivatives of a Bézier curve are
+Bézier curves of the differenced control points, so curvature and tangent direction are evaluated exactly at any
+parameter value instead of being estimated by finite differences on the sampled road points. All functions accept a
+single curve (N x 2) or a whole population (n x N x 2).
+"""
+
+import numpy as np
+
+from .bezier_geometry import bezier_curve, bezier_derivative_points
+
+
+def population_control_points(individuals):
+    """(n x N x 2) control point array of [xs, ys] individuals.
+    """
+    return np.swapaxes(np.asarray([[list(coordinates) for coordinates in individual] for individual in individuals], dtype=float), 1, 2)
+
+
+def _integrate(values, t):
+    # Trapezoidal rule along the last axis
+    return np.sum(0.5 * (values[..., 1:] + values[..., :-1]) * np.diff(t), axis=-1)
+
+
+def _derivatives(control_points, t):
+    d1_points = bezier_derivative_points(control_points)
+    return bezier_curve(d1_points, t), bezier_curve(bezier_derivative_points(d1_points), t)
+
+
+def road_features(control_points, num=200):
+    """Curvature based features of the road(s), as a dict of arrays with one entry per curve.
+
+    curvature:           signed curvature at num uniform parameter values
+    max_curvature:       largest absolute curvature
+    min_radius:          smallest radius of curvature (inf for a straight road)
+    total_turning_angle: integral of |curvature| over the arc length in radians, the sum of all turns
+    net_turning_angle:   angle between the start and end direction of the road (without wrapping)
+    length:              arc length of the road
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    t = np.linspace(0, 1, num=num)
+    d1, d2 = _derivatives(control_points, t)
+    cross = d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]
+    speed = np.linalg.norm(d1, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = np.where(speed > 0, cross / speed ** 3, 0.0)
+        # |curvature| ds = |cross| / speed^2 dt
+        turning_rate = np.where(speed > 0, np.abs(cross) / speed ** 2, 0.0)
+
+    tangent_angle = np.unwrap(np.arctan2(d1[..., 1], d1[..., 0]), axis=-1)
+    max_curvature = np.max(np.abs(curvature), axis=-1)
+    with np.errstate(divide='ignore'):
+        min_radius = np.where(max_curvature > 0, 1.0 / max_curvature, np.inf)
+
+    return {'curvature': curvature,
+            'max_curvature': max_curvature,
+            'min_radius': min_radius,
+            'total_turning_angle': _integrate(turning_rate, t),
+            'net_turning_angle': tangent_angle[..., -1] - tangent_angle[..., 0],
+            'length': _integrate(speed, t)}
+
+
+def curvature_peaks(control_points, num=200, min_curvature=0.0):
+    """Local maxima of |curvature| of a single curve as a list of (t, curvature, point), sharpest first.
+
+    The peaks found on the num parameter values are refined by fitting a parabola through the neighbouring samples.
+    """
+    control_points = np.asarray(control_points, dtype=float)
+    t = np.linspace(0, 1, num=num)
+    step = t[1] - t[0]
+
+    def absolute_curvature(values):
+        d1, d2 = _derivatives(control_points, values)
+        speed = np.linalg.norm(d1, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(speed > 0, np.abs(d1[..., 0] * d2[..., 1] - d1[..., 1] * d2[..., 0]) / speed ** 3, 0.0)
+
+    k = absolute_curvature(t)
+    inner = np.flatnonzero((k[1:-1] >= k[:-2]) & (k[1:-1] > k[2:]) & (k[1:-1] > min_curvature)) + 1
+
+    previous, current, following = k[inner - 1], k[inner], k[inner + 1]
+    denominator = previous - 2 * current + following
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(denominator != 0, 0.5 * (previous - following) / denominator, 0.0)
+    t_peaks = np.clip(t[inner] + offset * step, 0, 1)
+
+    # The ends of the road are peaks as well if the curvature is highest there
+    for end, neighbour in ((0, 1), (num - 1, num - 2)):
+        if k[end] > k[neighbour] and k[end] > min_curvature:
+            t_peaks = np.append(t_peaks, t[end])
+
+    if len(t_peaks) == 0:
+        return []
+    d1, d2 = _derivatives(control_points, t_peaks)
+    signed = (d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]) / np.linalg.norm(d1, axis=-1) ** 3
+    points = bezier_curve(control_points, t_peaks)
+    order = np.argsort(-np.abs(signed))
+    return [(float(t_peaks[i]), float(signed[i]), (float(points[i, 0]), float(points[i, 1]))) for i in order]
@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Producer/consumer execution of pre-computed roads. A producer thread fills a bounded queue with ready to run tests
+while one worker thread per executor takes them out and executes them. When the queue is full the producer blocks,
+so it never runs further ahead of the executors than the queue size.
+"""
+
+import logging as log
+import queue
+import threading
+
+
+class RoadQueue():
+    def __init__(self, produce, queue_size=32):
+        # produce() returns a list of ready to run items, it is called again whenever the list is used up
+        self.produce = produce
+        self.items = queue.Queue(maxsize=queue_size)
+        self.stop_event = threading.Event()
+        self.produced = 0
+        self.thread = None
+        self.error = None
+
+    def _fill(self):
+        try:
+            while not self.stop_event.is_set():
+                for item in self.produce():
+                    # Block while the queue is full, but keep watching for the stop signal
+                    while not self.stop_event.is_set():
+                        try:
+                            self.items.put(item, timeout=0.1)
+                            self.produced += 1
+                            break
+                        except queue.Full:
+                            pass
+                    if self.stop_event.is_set():
+                        break
+        except Exception as error:
+            log.exception("Road producer failed")
+            self.error = error
+            self.stop_event.set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._fill, name="road-producer", daemon=True)
+        self.thread.start()
+        return self
+
+    def get(self, timeout=0.1):
+        """Next item of the queue, None if the producer stopped before one became available.
+        """
+        while True:
+            try:
+                return self.items.get(timeout=timeout)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return None
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+
+def run_workers(road_queue, executors, consume):
+    """Execute the items of road_queue on all executors in parallel until their time budgets are used up.
+
+    consume(executor, item) is called by the worker thread of the executor, once per item.
+    """
+    def work(executor):
+        while executor.get_remaining_time() > 0:
+            item = road_queue.get()
+            if item is None:
+                break
+            consume(executor, item)
+
+    workers = [threading.Thread(target=work, args=(executor,), name="executor-worker-{}".format(nr), daemon=True)
+               for nr, executor in enumerate(executors)]
+    road_queue.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    road_queue.stop()
+
+    if road_queue.error is not None:
+        raise road_queue.error
+    log.info("Produced %d roads for %d executors", road_queue.produced, len(executors))
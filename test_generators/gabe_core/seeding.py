@@ -0,0 +1,60 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Reproducible random number streams of a test run. One master seed per run is spread by numpy's SeedSequence into
+independent streams for the initialization, the mutation, the crossover/selection and every worker, so that drawing
+more numbers in one of them (e.g. by a different number of executors) does not change the others.
+"""
+
+import json
+import os
+import random
+import numpy as np
+
+
+# Fixed spawn keys, a stream keeps its numbers when streams are added or used in a different order
+STREAMS = {"initialization": 0, "mutation": 1, "variation": 2, "fidelity": 4}
+WORKER_SPAWN_KEY = 3
+
+
+class RunSeeds():
+    def __init__(self, master_seed=None):
+        # Without a given seed a fresh one is drawn from the OS, it is recorded with the results to replay the run
+        self.master_seed = int(np.random.SeedSequence().entropy) if master_seed is None else int(master_seed)
+
+    def _sequence(self, *spawn_key):
+        return np.random.SeedSequence(self.master_seed, spawn_key=spawn_key)
+
+    def _stream_sequence(self, name):
+        return self._sequence(STREAMS[name])
+
+    def numpy_generator(self, name):
+        return np.random.default_rng(self._stream_sequence(name))
+
+    def python_random(self, name):
+        return random.Random(int(self._stream_sequence(name).generate_state(1, np.uint64)[0]))
+
+    def worker_generator(self, worker_nr):
+        return np.random.default_rng(self._sequence(WORKER_SPAWN_KEY, worker_nr))
+
+    def seed_global_random(self, name="variation"):
+        # DEAP's crossover and selection operators draw from the global random module
+        random.seed(int(self._stream_sequence(name).generate_state(1, np.uint64)[0]))
+
+    def record(self, filepath, **run_info):
+        """Store the master seed together with additional information of the run as JSON.
+        """
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        metadata = dict(run_info, master_seed=self.master_seed, streams=sorted(STREAMS))
+        with open(filepath, mode='w') as file:
+            json.dump(metadata, file, indent=2)
+        return filepath
+
+
+def load_master_seed(filepath):
+    """Master seed recorded by RunSeeds.record, to replay the run with the same random numbers.
+    """
+    with open(filepath) as file:
+        return json.load(file)["master_seed"]
@@ -0,0 +1,95 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Streaming test execution: executors that implement execute_test_streaming(the_test, on_state) call on_state with
+every collected simulation state and stop the simulation as soon as on_state returns a (test_outcome, description) pair.
+"""
+
+import logging as log
+import numpy as np
+
+from .oob_statistics import OOBStatistics
+
+
+def _signed_curvature(points):
+    """Menger curvature of every inner point of a polyline, signed by the turning direction.
+    """
+    points = np.asarray(points, dtype=float)[:, :2]
+    curvature = np.zeros(len(points))
+    if len(points) < 3:
+        return curvature
+
+    a = points[1:-1] - points[:-2]
+    b = points[2:] - points[1:-1]
+    c = points[2:] - points[:-2]
+    cross = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    lengths = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1) * np.linalg.norm(c, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature[1:-1] = np.where(lengths > 0, 2.0 * cross / lengths, 0.0)
+
+    return curvature
+
+
+def _arc_length(points):
+    points = np.asarray(points, dtype=float)[:, :2]
+    return np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+
+
+class EarlyTerminationMonitor():
+    """Decides for every streamed simulation state whether the outcome of the running test is already known.
+
+    The test is stopped as FAIL as soon as the OOB percentage crosses oob_tolerance, and as PASS once the vehicle
+    drove pass_distance meters past the point of maximum curvature without ever getting closer than pass_margin
+    to the lane border.
+    """
+    def __init__(self, road_points, oob_tolerance=0.95, pass_margin=1.0, pass_distance=20.0):
+        self.road_points = np.asarray(road_points, dtype=float)[:, :2]
+        self.oob_tolerance = oob_tolerance
+        self.pass_margin = pass_margin
+        self.pass_distance = pass_distance
+
+        self.arc_length = _arc_length(self.road_points)
+        peak_index = int(np.argmax(np.abs(_signed_curvature(self.road_points))))
+        self.peak_arc_length = self.arc_length[peak_index]
+
+        self.progress_index = 0
+        self.oob_statistics = OOBStatistics()
+        self.stop_reason = None
+
+    def _update_progress(self, pos):
+        distances = np.sum((self.road_points - np.asarray(pos[:2], dtype=float)) ** 2, axis=1)
+        # The vehicle only moves forward along the road, never let the progress jump back
+        self.progress_index = max(self.progress_index, int(np.argmin(distances)))
+
+    def __call__(self, state):
+        self.oob_statistics.update(state)
+
+        if state.oob_percentage > self.oob_tolerance:
+            self.stop_reason = ('FAIL', "Early termination: OOB percentage {:.3f} above tolerance {}".format(state.oob_percentage, self.oob_tolerance))
+            return self.stop_reason
+
+        self._update_progress(state.pos)
+        distance_past_peak = self.arc_length[self.progress_index] - self.peak_arc_length
+        min_oob_distance = self.oob_statistics.min_oob_distance
+        if distance_past_peak > self.pass_distance and min_oob_distance > self.pass_margin:
+            self.stop_reason = ('PASS', "Early termination: passed maximum curvature with OOB distance {:.3f}".format(min_oob_distance))
+            return self.stop_reason
+
+        return None
+
+
+def run_test(executor, the_test, monitor=None):
+    """Execute the_test and return (test_outcome, description, execution_data).
+
+    The states are streamed to monitor if one is given and the executor supports streaming, otherwise the test is
+    executed as a whole by execute_test.
+    """
+    if monitor is not None and hasattr(executor, 'execute_test_streaming'):
+        test_outcome, description, execution_data = executor.execute_test_streaming(the_test, monitor)
+        if monitor.stop_reason is not None:
+            log.info("Stopped simulation after %d states: %s", len(execution_data), monitor.stop_reason[1])
+        return test_outcome, description, execution_data
+
+    return executor.execute_test(the_test)
@@ -0,0 +1,76 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Archive of the simulation traces of failing (and optionally near-failing) tests. Selected state columns are stored as
+compressed .npy members of a zip file (the .npz layout), one member per test and column, so a single trace is read
+without loading the rest of the archive:
+
+    traces = TraceArchive(filepath)
+    trace = traces.load(traces.test_ids()[0])
+    trace['oob_distance']
+"""
+
+import os
+import zipfile
+import numpy as np
+
+TRACE_COLUMNS = ('timer', 'pos', 'vel_kmh', 'oob_distance', 'oob_percentage')
+
+
+def trace_arrays(execution_data, columns=TRACE_COLUMNS):
+    """One float32 array per state column, positions as (n x 2) arrays of x and y.
+    """
+    arrays = {}
+    for column in columns:
+        values = [getattr(state, column) for state in execution_data]
+        if column == 'pos':
+            arrays[column] = np.array([value[:2] for value in values], dtype=np.float32).reshape(-1, 2)
+        else:
+            arrays[column] = np.array(values, dtype=np.float32)
+    return arrays
+
+
+class TraceArchive():
+    def __init__(self, filepath, near_failure_distance=None, columns=TRACE_COLUMNS):
+        self.filepath = filepath
+        # Passing tests with a min OOB distance below near_failure_distance are archived as well
+        self.near_failure_distance = near_failure_distance
+        self.columns = columns
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+
+    def should_store(self, test_outcome, min_oob_distance):
+        if test_outcome == 'FAIL':
+            return True
+        return test_outcome == 'PASS' and self.near_failure_distance is not None and min_oob_distance < self.near_failure_distance
+
+    def add(self, test_id, execution_data):
+        arrays = trace_arrays(execution_data, self.columns)
+        # Appending only adds the new members and rewrites the central directory
+        with zipfile.ZipFile(self.filepath, mode='a', compression=zipfile.ZIP_DEFLATED) as archive:
+            for column, array in arrays.items():
+                with archive.open("{}/{}.npy".format(test_id, column), mode='w') as member:
+                    np.lib.format.write_array(member, array, allow_pickle=False)
+
+    def test_ids(self):
+        if not os.path.exists(self.filepath):
+            return []
+        with zipfile.ZipFile(self.filepath) as archive:
+            return list(dict.fromkeys(name.split('/')[0] for name in archive.namelist()))
+
+    def load(self, test_id, columns=None):
+        """Dict of the stored columns (or only the given ones) of the trace of test_id.
+        """
+        with zipfile.ZipFile(self.filepath) as archive:
+            prefix = "{}/".format(test_id)
+            names = [name for name in archive.namelist() if name.startswith(prefix)]
+            if not names:
+                raise KeyError(test_id)
+            trace = {}
+            for name in names:
+                column = name[len(prefix):-len('.npy')]
+                if columns is None or column in columns:
+                    with archive.open(name) as member:
+                        trace[column] = np.lib.format.read_array(member, allow_pickle=False)
+            return trace
@@ -0,0 +1,69 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Import time benchmark of the test generators. Every generator module is imported in a fresh interpreter, as the code
+pipeline does once per run, and the wall time of the import as well as the slowest imported modules are reported.
+
+    python import_benchmark.py [--repeat 5] [--top 5] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+GENERATOR_MODULES = ["gabe_sva_control_parameter_generator", "gabe_svb_control_parameter_generator",
+                     "gabe_svc_control_parameter_generator", "bezier_random_generator", "random_tool_comp_generator"]
+
+
+def _import_once(module, cwd):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import {}".format(module)], cwd=cwd,
+                            capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+
+def _slowest_imports(importtime_output, top):
+    # Lines look like "import time:  self [us] | cumulative | imported package", nested imports are indented by two
+    # spaces per level. Only the direct imports of the benchmarked module are counted.
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if cumulative.strip().isdigit() and depth == 1:
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def benchmark(modules, repeat=5, top=5):
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    baseline = min(_import_once("sys", cwd)[0] for _ in range(repeat))
+    print("Interpreter start-up: {:.1f} ms".format(baseline * 1000))
+
+    for module in modules:
+        times = []
+        for _ in range(repeat):
+            elapsed, result = _import_once(module, cwd)
+            if result.returncode != 0:
+                print("{}: import failed: {}".format(module, result.stderr.strip().splitlines()[-1]))
+                break
+            times.append(elapsed)
+        else:
+            print("{}: {:.1f} ms (best of {}, start-up subtracted)".format(module, (min(times) - baseline) * 1000, repeat))
+            for cumulative, name in _slowest_imports(result.stderr, top):
+                print("    {:>8.1f} ms  {}".format(cumulative / 1000, name))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the import time of the test generators")
+    parser.add_argument("modules", nargs="*", default=GENERATOR_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="number of slowest top level imports shown per module")
+    args = parser.parse_args()
+    benchmark(args.modules, args.repeat, args.top)
@@ -0,0 +1,149 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Surface plots of the GA-Bézier control parameter study. For every search variant the master CSV is read and the
+population size is plotted against the crossing and the mutation probability for P(fail), Fréchet distance, sparseness
+and TTF, each point the mean over all test runs (and values of the third parameter) of that combination. The plots are
+rendered in a process pool, plots whose master CSV did not change since they were written last are skipped.
+
+    python surface_plot_report.py [--results-root ../empirical_evaluation_results] [--formats png pdf] [--workers 4] [--force]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import hashlib
+import json
+import os
+import time
+import warnings
+import numpy as np
+
+
+VARIANTS = ['a', 'b', 'c']
+# Plot name suffix: (master CSV column, axis label)
+METRICS = {'pfail': ('P(fail)', 'Failure Probability'),
+           'frech': ('Frechet', 'Fréchet Distance'),
+           'spars': ('Spars.', 'Sparseness'),
+           'ttf': ('TTF', 'Time-to-Failure')}
+PARAMETERS = {'cross': ('CXPB', 'Crossing Probability'),
+              'mut': ('MUTPB', 'Mutation Probability')}
+CACHE_FILENAME = 'plot_cache.json'
+
+
+def _variant_folder(results_root, variant):
+    return os.path.join(results_root, 'gabe_control_parameter_results', 'gabe_search_variant_' + variant)
+
+
+def _read_master_csv(filepath):
+    with open(filepath, newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def surface_grid(rows, parameter_column, metric_column):
+    """Population sizes, parameter values and the (parameter x population) grid of mean metric values.
+    """
+    populations = sorted({int(row['POP']) for row in rows})
+    values = sorted({float(row[parameter_column]) for row in rows})
+    cells = {}
+    for row in rows:
+        key = (values.index(float(row[parameter_column])), populations.index(int(row['POP'])))
+        cells.setdefault(key, []).append(float(row[metric_column]))
+    grid = np.full((len(values), len(populations)), np.nan)
+    with warnings.catch_warnings():
+        # Combinations without any failure have no Fréchet, sparseness or TTF value
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        for (i, j), cell_values in cells.items():
+            grid[i, j] = np.nanmean(cell_values)
+    return populations, values, grid
+
+
+def _render(job):
+    # Runs in a worker process, so pyplot is set up there with a non-interactive backend
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    populations, values, grid = surface_grid(_read_master_csv(job['master_csv']), PARAMETERS[job['parameter']][0], METRICS[job['metric']][0])
+    x, y = np.meshgrid(populations, values)
+
+    fig = plt.figure(figsize=(10, 8))
+    ax = fig.add_subplot(projection='3d')
+    surface = ax.plot_surface(x, y, grid, cmap='viridis', edgecolor='none')
+    fig.colorbar(surface, shrink=0.6)
+    ax.set_xlabel("Population Size")
+    ax.set_ylabel(PARAMETERS[job['parameter']][1])
+    ax.set_zlabel(METRICS[job['metric']][1])
+    ax.set_xticks(populations)
+    ax.set_yticks(values)
+    for filepath in job['outputs']:
+        fig.savefig(filepath, dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return job['name']
+
+
+def _file_hash(filepath):
+    with open(filepath, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def plot_jobs(results_root, formats):
+    jobs = []
+    for variant in VARIANTS:
+        folder = _variant_folder(results_root, variant)
+        master_csv = os.path.join(folder, 'gabe_search_variant_{}_Master_CSV.csv'.format(variant))
+        if not os.path.exists(master_csv):
+            print("No master CSV for search variant {}, skipped".format(variant))
+            continue
+        plot_folder = os.path.join(folder, 'surface_plots')
+        os.makedirs(plot_folder, exist_ok=True)
+        csv_hash = _file_hash(master_csv)
+        for parameter in PARAMETERS:
+            for metric in METRICS:
+                name = 'gabe_{}_pop_{}_{}'.format(variant, parameter, metric)
+                jobs.append({'name': name, 'master_csv': master_csv, 'parameter': parameter, 'metric': metric,
+                             'plot_folder': plot_folder,
+                             'outputs': [os.path.join(plot_folder, name + '.' + extension) for extension in formats],
+                             # Key of the inputs of the plot, it is redrawn when any of them changed
+                             'key': hashlib.sha256(json.dumps([csv_hash, parameter, metric, sorted(formats)]).encode()).hexdigest()})
+    return jobs
+
+
+def _load_cache(plot_folder):
+    try:
+        with open(os.path.join(plot_folder, CACHE_FILENAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def report(results_root, formats=('png',), workers=None, force=False):
+    start = time.perf_counter()
+    jobs = plot_jobs(results_root, formats)
+    caches = {folder: _load_cache(folder) for folder in {job['plot_folder'] for job in jobs}}
+    outdated = [job for job in jobs if force or caches[job['plot_folder']].get(job['name']) != job['key']
+                or not all(os.path.exists(filepath) for filepath in job['outputs'])]
+    print("{} of {} plots up to date".format(len(jobs) - len(outdated), len(jobs)))
+
+    if outdated:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for job, name in zip(outdated, pool.map(_render, outdated)):
+                print("Plotted", name)
+                caches[job['plot_folder']][name] = job['key']
+
+    for folder, cache in caches.items():
+        with open(os.path.join(folder, CACHE_FILENAME), mode='w') as file:
+            json.dump(cache, file, indent=2, sort_keys=True)
+    print("Report finished in {:.1f} s".format(time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Surface plots of the GA-Bézier control parameter study")
+    parser.add_argument('--results-root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'empirical_evaluation_results'))
+    parser.add_argument('--formats', nargs='+', default=['png'], help="file formats of the plots (png, pdf, svg)")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument('--force', action='store_true', help="redraw all plots, even if their inputs did not change")
+    args = parser.parse_args()
+    report(args.results_root, args.formats, args.workers, args.force)
@@ -0,0 +1,14 @@
+"""
+Copyright (C) 2022, F. Klück and L. Klampfl.
+This code intentional usage is for obtaining rusults for the paper "Using Genetic Algorithms for Automating ALKS Testing"
+submitted and currently under review in the Journal of Software: Evolution and Process - Search-based testing Special Issue.
+
+Unit tests of the numeric kernels of gabe_core, run from test_generators with python -m pytest tests. The generators
+themselves need the code pipeline and a simulator and are not covered here.
+"""
+
+import os
+import sys
+
+# The generators import gabe_core as a top level package from test_generators
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
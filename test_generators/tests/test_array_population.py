@@ -0,0 +1,118 @@
+import copy
+
+import numpy as np
+from deap import base, tools
+import deap.tools.crossover
+import deap.tools.selection
+
+from gabe_core.array_population import ArrayPopulation, ea_simple_array
+from gabe_core.operators import control_point_mutation
+
+
+class FitnessMin(base.Fitness):
+    weights = (-1.0,)
+
+
+class Individual(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.fitness = FitnessMin()
+
+
+class NumpyRandom():
+    # The functions of the random module used by DEAP, drawing from a numpy generator in the same order
+    def __init__(self, rng):
+        self.rng = rng
+
+    def random(self):
+        return self.rng.random()
+
+    def randint(self, a, b):
+        return int(self.rng.integers(a, b + 1))
+
+    def choice(self, seq):
+        return seq[int(self.rng.integers(0, len(seq)))]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.rng.random()
+
+
+def _population(pop_size=10, number_of_controlpoints=7, map_size=200, seed=0):
+    rng = np.random.default_rng(seed)
+    genes = rng.uniform(0, map_size, size=(pop_size, 2, number_of_controlpoints))
+    return ArrayPopulation(genes, rng.normal(size=pop_size))
+
+
+def test_select_tournament_reproduces_sel_tournament(monkeypatch):
+    population = _population(pop_size=30)
+    individuals = population.views(Individual)
+    rng = np.random.default_rng(1)
+    monkeypatch.setattr(deap.tools.selection, 'random', NumpyRandom(copy.deepcopy(rng)))
+
+    selected = population.select_tournament(len(population), 3, rng)
+    expected = tools.selTournament(individuals, len(individuals), tournsize=3)
+
+    assert np.array_equal(selected.genes, np.array(expected))
+    assert np.array_equal(selected.fitness, [ind.fitness.values[0] for ind in expected])
+
+
+def test_crossover_two_point_reproduces_cx_two_point(monkeypatch):
+    for seed in range(20):
+        population = _population(pop_size=2, seed=seed)
+        first, second = population.views(Individual)
+        rng = np.random.default_rng(seed)
+        reference_rng = NumpyRandom(copy.deepcopy(rng))
+        monkeypatch.setattr(deap.tools.crossover, 'random', reference_rng)
+
+        mated = population.crossover_two_point(0.5, rng)
+        # As in deap.algorithms.varAnd, the crossover probability is drawn before the cut points
+        if reference_rng.random() < 0.5:
+            first, second = tools.cxTwoPoint(first, second)
+
+        assert np.array_equal(population.genes, np.array([first, second]))
+        assert np.isnan(population.fitness[0]) == bool(mated)
+
+
+def test_mutate_matches_control_point_mutation():
+    map_size, indpb = 200, 0.5
+    population = _population(pop_size=2000, map_size=map_size)
+    original = population.genes.copy()
+    population.mutate(1.0, indpb, map_size, np.random.default_rng(2))
+    array_steps = population.genes - original
+
+    rng = np.random.default_rng(3)
+    list_steps = []
+    for genes in original:
+        individual = Individual(genes.tolist())
+        control_point_mutation(individual, indpb, map_size, rng=NumpyRandom(rng))
+        list_steps.append(np.array(individual) - genes)
+    list_steps = np.array(list_steps)
+
+    for steps in (array_steps, list_steps):
+        # The end points stay fixed, x and y of a control point are mutated together
+        assert not np.any(steps[:, :, [0, -1]])
+        assert np.array_equal(steps[:, 0] != 0, steps[:, 1] != 0)
+        assert np.all(np.abs(steps) <= map_size / 40)
+    assert np.all((population.genes >= 0) & (population.genes <= map_size))
+    assert abs(np.mean(array_steps != 0) - np.mean(list_steps != 0)) < 0.02
+    assert abs(np.mean(np.abs(array_steps[array_steps != 0])) - np.mean(np.abs(list_steps[list_steps != 0]))) < 0.1
+
+
+def test_ea_simple_array_statistics_and_hall_of_fame():
+    population = _population(pop_size=20)
+    population.fitness[:] = np.nan
+    rng = np.random.default_rng(4)
+
+    def evaluate(individual):
+        return (float(np.sum(individual)),)
+
+    stats = tools.Statistics(lambda ind: ind.fitness.values)
+    stats.register("min", np.min)
+    stats.register("max", np.max)
+    hof = tools.HallOfFame(1)
+    population, logbook = ea_simple_array(population, evaluate, Individual, cxpb=0.8, mutpb=0.5, ngen=5, map_size=200,
+                                          rng=rng, stats=stats, halloffame=hof)
+
+    assert logbook[-1]['min'] == population.fitness.min()
+    assert logbook[-1]['max'] == population.fitness.max()
+    assert hof[0].fitness.values[0] == min(record['min'] for record in logbook)
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+
+from gabe_core.composite_bezier import CompositeBezierRoad, enforce_c1
+
+
+def _tangent_jumps(individual, degree=3):
+    # Difference of the derivatives of the segments ending and starting at every interior junction
+    control_points = np.column_stack(individual)
+    jumps = []
+    for junction in range(degree, len(control_points) - 1, degree):
+        incoming = degree * (control_points[junction] - control_points[junction - 1])
+        outgoing = degree * (control_points[junction + 1] - control_points[junction])
+        jumps.append(np.linalg.norm(outgoing - incoming))
+    return np.array(jumps)
+
+
+def test_enforce_c1_makes_the_junction_tangents_continuous():
+    rng = random.Random(0)
+    individual = [[rng.uniform(0, 200) for _ in range(13)] for _ in range(2)]
+    assert np.any(_tangent_jumps(individual) > 1e-6)
+
+    enforce_c1(individual)
+
+    assert np.allclose(_tangent_jumps(individual), 0.0)
+
+
+def test_random_roads_are_valid_and_c1():
+    road = CompositeBezierRoad(map_size=500)
+    rng = random.Random(1)
+    for _ in range(10):
+        individual = road.random_road(6, rng=rng)
+        assert individual is not None
+        assert len(individual[0]) == 6 * road.degree + 1
+        assert np.allclose(_tangent_jumps(individual), 0.0)
+        assert road.validate(individual) == (True, "")
+
+
+def test_variation_keeps_the_roads_c1():
+    road = CompositeBezierRoad(map_size=500)
+    rng = random.Random(2)
+    population = [road.random_road(6, rng=rng) for _ in range(10)]
+    for _ in range(10):
+        for ind1, ind2 in zip(population[::2], population[1::2]):
+            road.crossover(ind1, ind2, rng=rng)
+        for individual in population:
+            start, last = (individual[0][0], individual[1][0]), (individual[0][-1], individual[1][-1])
+            road.mutate(individual, 0.5, mutation_range=5.0, rng=rng)
+            assert (individual[0][0], individual[1][0]) == start
+            assert (individual[0][-1], individual[1][-1]) == last
+            assert np.allclose(_tangent_jumps(individual), 0.0)
+
+
+def test_road_points_share_the_junctions_and_only_changed_segments_are_recomputed():
+    road = CompositeBezierRoad(map_size=500)
+    individual = road.random_road(4, rng=random.Random(3))
+    points = road.road_points(individual)
+    assert len(points) == 4 * (road.points_per_segment - 1) + 1
+    assert np.allclose(points[0], (individual[0][0], individual[1][0]))
+    assert np.allclose(points[-1], (individual[0][-1], individual[1][-1]))
+
+    computed = road.computed_segments
+    # Moving the last inner control point only changes the last segment
+    individual[0][-2] += 1.0
+    road.road_points(individual)
+    assert road.computed_segments == computed + 1
@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+
+from gabe_core.live_metrics import LiveMetrics, _discrete_frechet
+
+
+def _reference_frechet(p, q):
+    # Textbook dynamic programming over all couplings, cell by cell
+    n, m = len(p), len(q)
+    coupling = np.zeros((n, m))
+    for i in range(n):
+        for j in range(m):
+            distance = np.linalg.norm(p[i] - q[j])
+            if i == 0 and j == 0:
+                coupling[i, j] = distance
+            elif i == 0:
+                coupling[i, j] = max(coupling[i, j - 1], distance)
+            elif j == 0:
+                coupling[i, j] = max(coupling[i - 1, j], distance)
+            else:
+                coupling[i, j] = max(min(coupling[i - 1, j], coupling[i - 1, j - 1], coupling[i, j - 1]), distance)
+    return coupling[-1, -1]
+
+
+def test_discrete_frechet_matches_the_reference():
+    rng = np.random.default_rng(0)
+    # Also the degenerate shapes whose anti-diagonals have no inner cells
+    for n, m in ((1, 1), (1, 5), (5, 1), (2, 2), (7, 3), (32, 32)):
+        p = rng.uniform(0, 100, size=(n, 2))
+        qs = rng.uniform(0, 100, size=(4, m, 2))
+        assert np.allclose(_discrete_frechet(p, qs), [_reference_frechet(p, q) for q in qs])
+
+
+def test_discrete_frechet_of_shifted_roads():
+    p = np.column_stack((np.linspace(0, 100, 20), np.zeros(20)))
+    assert np.allclose(_discrete_frechet(p, np.array([p, p + (0.0, 3.0)])), [0.0, 3.0])
+
+
+def test_status_reports_the_windowed_metrics(tmp_path):
+    filepath = str(tmp_path / "status.json")
+    metrics = LiveMetrics(filepath, num=16, comparisons=2)
+    road = np.column_stack((np.linspace(0, 100, 50), np.zeros(50)))
+    metrics.update('PASS', road)
+    for offset in (0.0, 2.0, 4.0, 6.0):
+        metrics.update('FAIL', road + (0.0, offset))
+
+    with open(filepath) as file:
+        status = json.load(file)
+    assert (status['tests'], status['failed'], status['ttf']) == (5, 4, 2)
+    # A new failure is only compared with the last two: 2 (second), 4 and 2 (third), 4 and 2 but not 6 (fourth)
+    assert np.isclose(status['recent_sparseness'], 14.0 / 5, atol=1e-3)
+    assert np.isclose(status['recent_frechet'], 14.0 / 5, atol=1e-3)
+    assert (status['comparison_window'], status['resample_points']) == (2, 16)
@@ -0,0 +1,32 @@
+import random
+
+import numpy as np
+
+from gabe_core.bezier_geometry import bezier_curve
+from gabe_core.multi_fidelity import FidelityScreen, LowFidelityResult
+from gabe_core.population_sampling import sample_valid_population
+
+
+def _valid_random_roads(n, map_size=200, number_of_controlpoints=7, seed=0):
+    control_points = sample_valid_population(np.random.default_rng(seed), n, map_size, number_of_controlpoints, int(map_size / number_of_controlpoints))
+    return bezier_curve(np.swapaxes(control_points, 1, 2), np.linspace(0, 1, num=200))
+
+
+def test_screen_promotes_a_minority_of_realistic_roads():
+    screen = FidelityScreen(0.25, calibration_rate=0.0, rng=random.Random(0))
+    results = [screen.screen(road) for road in _valid_random_roads(200)]
+    promoted = sum(result.promoted is not None for result in results)
+    assert promoted < 0.3 * len(results)
+    assert any(result.test_outcome == 'PASS' for result in results)
+
+
+def test_calibration_moves_the_threshold_to_the_residual_quantile():
+    screen = FidelityScreen(0.25, rng=random.Random(0), quantile=0.05, min_calibration_samples=20)
+    for i in range(40):
+        low_fidelity = LowFidelityResult('PASS', 1.0, 'calibration')
+        # The simulation keeps 1.2 to 1.59 m less distance to the lane border than the model
+        screen.record(low_fidelity, 'PASS', 1.0 - 1.2 - i / 100)
+    residual_quantile = np.quantile([-1.2 - i / 100 for i in range(40)], 0.05)
+    assert np.isclose(screen.threshold, screen.failure_distance - residual_quantile)
+    # The model is optimistic, roads closer than the initial threshold to the lane border can fail
+    assert screen.threshold > 0.25
@@ -0,0 +1,26 @@
+import numpy as np
+from scipy.interpolate import splev, splprep
+
+from gabe_core.bezier_geometry import bezier_curve
+from gabe_core.population_sampling import fast_interpolation_validity_check, interpolation_control_points
+
+
+def test_interpolation_control_points_reproduce_the_pipeline_interpolation():
+    rng = np.random.default_rng(0)
+    road_points = rng.uniform(10, 190, size=(50, 3, 2))
+    control_points = interpolation_control_points(road_points)
+    t = np.linspace(0, 1, num=100)
+    for points, curve in zip(road_points, bezier_curve(control_points, t)):
+        # The pipeline interpolates three road points by splprep with k=2 and no smoothing
+        tck, _ = splprep([points[:, 0], points[:, 1]], s=0, k=2)
+        assert np.allclose(np.column_stack(splev(t, tck)), curve, atol=1e-6)
+
+
+def test_fast_interpolation_validity_check():
+    road_points = np.array([[(90, 10), (100, 100), (110, 190)], # gentle curve across the map
+                            [(90, 10), (100, 100), (90, 10)], # turns back on itself
+                            [(90, 10), (90, 10), (110, 190)], # coinciding points
+                            [(100, 100), (102, 105), (104, 110)], # shorter than min_length
+                            [(10, 10), (250, 100), (20, 190)]], dtype=float) # bulges out of the map
+
+    assert fast_interpolation_validity_check(road_points, 200).tolist() == [True, False, False, False, False]
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+
+from gabe_core.results import ResultFiles
+
+
+def _run_nr(results_path):
+    return ResultFiles(str(results_path), "config").unique_filename.split('-RUN_')[0]
+
+
+def test_consecutive_runs_get_new_numbers(tmp_path):
+    assert [_run_nr(tmp_path) for _ in range(3)] == ['0', '1', '2']
+
+
+def test_numbers_of_runs_written_before_the_registry_are_skipped(tmp_path):
+    evaluation_folder = tmp_path / "results_test_runs"
+    evaluation_folder.mkdir()
+    for name in ("0-RUN_config.csv", "2-RUN_other.csv"):
+        (evaluation_folder / name).write_text("")
+
+    assert [_run_nr(tmp_path) for _ in range(2)] == ['3', '4']
+
+
+def test_a_claimed_number_is_not_given_out_again(tmp_path):
+    files = ResultFiles(str(tmp_path), "config")
+    # The run crashed before writing anything
+    os.remove(files.csv_eval_filepath)
+
+    assert _run_nr(tmp_path) == '1'
+
+
+def test_concurrent_runs_get_distinct_numbers(tmp_path):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        thread_numbers = list(pool.map(_run_nr, [tmp_path] * 16))
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        process_numbers = pool.map(_run_nr, [tmp_path] * 8)
+
+    numbers = thread_numbers + process_numbers
+    assert len(set(numbers)) == len(numbers)
+    assert len(os.listdir(tmp_path / "run_registry")) == len(numbers)
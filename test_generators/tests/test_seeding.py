@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from gabe_core.operators import control_point_mutation, random_control_points
+from gabe_core.seeding import RunSeeds, STREAMS, load_master_seed
+
+
+def _draws(seeds):
+    draws = {}
+    for name in STREAMS:
+        python_random = seeds.python_random(name)
+        draws[name] = (seeds.numpy_generator(name).random(5).tolist(), [python_random.random() for _ in range(5)])
+    return draws
+
+
+def test_the_same_master_seed_gives_the_same_streams():
+    assert _draws(RunSeeds(42)) == _draws(RunSeeds(42))
+    assert _draws(RunSeeds(42)) != _draws(RunSeeds(43))
+
+
+def test_streams_are_independent_of_each_other():
+    draws = _draws(RunSeeds(42))
+    assert len({tuple(numpy_draws) for numpy_draws, _ in draws.values()}) == len(STREAMS)
+
+    seeds = RunSeeds(42)
+    mutation = seeds.python_random("mutation")
+    # Drawing from other streams and workers, in any number, does not change the mutation stream
+    seeds.python_random("initialization").random()
+    for worker_nr in range(8):
+        seeds.worker_generator(worker_nr).random(100)
+    assert [mutation.random() for _ in range(5)] == draws["mutation"][1]
+
+
+def test_seeded_initialization_and_mutation_are_reproducible():
+    def run(master_seed):
+        seeds = RunSeeds(master_seed)
+        init_random, mutation_random = seeds.python_random("initialization"), seeds.python_random("mutation")
+        individuals = [random_control_points(200, 7, 28, init_random) for _ in range(10)]
+        for individual in individuals:
+            control_point_mutation(individual, 0.5, 200, mutation_random)
+        return individuals
+
+    assert run(7) == run(7)
+    assert run(7) != run(8)
+
+
+def test_global_random_is_seeded_from_the_variation_stream():
+    RunSeeds(42).seed_global_random()
+    first = [random.random() for _ in range(5)]
+    RunSeeds(42).seed_global_random()
+    assert [random.random() for _ in range(5)] == first
+
+
+def test_recorded_master_seed_replays_the_run(tmp_path):
+    seeds = RunSeeds()
+    filepath = seeds.record(str(tmp_path / "run_metadata" / "run.json"), generator="test")
+
+    replay = RunSeeds(load_master_seed(filepath))
+    assert np.array_equal(replay.worker_generator(3).random(5), seeds.worker_generator(3).random(5))
+    assert _draws(replay) == _draws(seeds)